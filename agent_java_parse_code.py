@@ -1,27 +1,38 @@
 import asyncio
-from autogen_ext.tools.mcp import StdioServerParams, mcp_server_tools
-from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-import requests
-from bs4 import BeautifulSoup
 import sys
+from context_retriever import BM25Index, select_context
+from hierarchical_summarizer import summarize_each, task_result_text
+from project_writer import LocalFileWriter, SaveFileToolWriter, generate_and_write
+from tracing import span
 
 CHUNK_SIZE = 4000  # tokens aproximados
+FETCH_TIMEOUT = 30  # segundos
+
+def _fetch_java_code_sync(url: str) -> list[str]:
+    import requests
+    from bs4 import BeautifulSoup
+
+    with span("fetch", url=url) as s:
+        response = requests.get(url, timeout=FETCH_TIMEOUT)
+        response.raise_for_status()
+        s.set(bytes=len(response.content))
+    
+    with span("parse_html") as s:
+        soup = BeautifulSoup(response.text, "html.parser")
+        
+        java_codes = []
+        for code_block in soup.select("pre > code.language-java"):
+            java_codes.append(code_block.get_text())
+        s.set(snippets=len(java_codes))
+    
+    return java_codes
 
 async def fetch_java_code(url: str) -> list[str]:
     """
     Acessa a URL, parseia HTML e retorna uma lista de trechos de código Java.
+    Roda em uma thread para não bloquear o event loop (ex.: workers do batch_runner).
     """
-    response = requests.get(url)
-    response.raise_for_status()
-    
-    soup = BeautifulSoup(response.text, "html.parser")
-    
-    java_codes = []
-    for code_block in soup.select("pre > code.language-java"):
-        java_codes.append(code_block.get_text())
-    
-    return java_codes
+    return await asyncio.to_thread(_fetch_java_code_sync, url)
 
 async def chunk_text(text, size=CHUNK_SIZE):
     """Divide o texto em chunks menores"""
@@ -30,56 +41,97 @@ async def chunk_text(text, size=CHUNK_SIZE):
         chunks.append(text[i:i+size])
     return chunks
 
-async def main():
-    # MCP local
-    fetch_mcp_server = StdioServerParams(command="uvx", args=["mcp-server-fetch"])
-    tools = await mcp_server_tools(fetch_mcp_server)
+SUMMARY_PROMPT = "Summarize the following Java code snippet:"
+
+async def summarize_snippets(model_client, java_snippets: list[str]) -> list[str]:
+    """Resume cada trecho com uma chamada sem estado; um resumo por trecho, na mesma ordem."""
+    return await summarize_each(model_client, java_snippets, prompt=SUMMARY_PROMPT)
+
+def project_file_tasks(output_dir: str = "project") -> list[dict]:
+    """
+    Arquivos do projeto gerado: caminho relativo ao projeto ("file"), caminho de
+    gravação ("path"), consulta ao índice de contexto e prompt.
+    """
+    files = [
+        {"file": "src/main/java/com/example/MainApplication.java",
+         "query": "SpringBootApplication main class Application SpringApplication run",
+         "prompt": "Generate a Spring Boot MainApplication.java class using the following code:"},
+        {"file": "src/main/java/com/example/controller/HelloController.java",
+         "query": "RestController HelloController GetMapping RequestMapping endpoint",
+         "prompt": "Generate a REST controller HelloController.java using the following code:"},
+        {"file": "pom.xml",
+         "query": "Maven pom dependency spring boot starter web actuator test plugin",
+         "prompt": "Generate a Maven pom.xml file for a Spring Boot project using the following code:"},
+        {"file": "README.md",
+         "query": "build run application mvn gradle test curl endpoint",
+         "prompt": "Generate a README.md explaining how to build and run the project:"}
+    ]
+    return [{**task, "path": f"{output_dir}/{task['file']}"} for task in files]
 
-    # Agente
-    agent = AssistantAgent(
-        name="architect_agent",
-        model_client=OpenAIChatCompletionClient(model="gpt-4.1-mini"),
-        tools=tools
-    )
+async def generate_file(task: dict, context_index: BM25Index, model_client, tools: list) -> str:
+    """Gera o conteúdo de um arquivo com só o contexto relevante para ele."""
+    from autogen_agentchat.agents import AssistantAgent
 
+    with span("retrieve", path=task["path"]):
+        # A consulta usa o caminho relativo: o diretório de saída (hash do lote, tmp)
+        # não pode mudar o contexto recuperado
+        context = select_context(context_index, f"{task['file']} {task['query']}")
+    # Um agente por arquivo: os prompts não carregam o histórico uns dos outros
+    file_agent = AssistantAgent(name="file_generator", model_client=model_client, tools=tools)
+    with span("generate", path=task["path"]) as s:
+        result = await file_agent.run(task=f"{task['prompt']}\n{context}")
+        s.record_usage(result)
+    return task_result_text(result)
+
+async def generate_project(url: str, model_client, tools: list, writer, output_dir: str = "project") -> list[dict]:
+    """
+    Extrai o código Java da URL, resume os trechos e gera os arquivos do projeto.
+
+    Returns:
+        Relatório por arquivo gravado (ver project_writer.generate_and_write)
+    """
     # ===== Passo 1: Fetch URL e extrair código Java =====
-    url = "https://spring.io/guides/gs/spring-boot"
     java_snippets = await fetch_java_code(url)
 
     # ===== Passo 2: Chunking e resumo =====
-    summarized_chunks = []
-    for snippet in java_snippets:
-        summary_task = f"Summarize the following Java code snippet:\n{snippet}"
-        summary = await agent.run(task=summary_task)
-        summarized_chunks.append(summary)
+    # Chamadas sem estado e em paralelo: cada resumo paga só pelo próprio trecho
+    summarized_chunks = await summarize_snippets(model_client, java_snippets)
 
     summarized_code = "\n".join(summarized_chunks)
     print("\n=== Código Java resumido ===")
     print(summarized_code[:1000])  # mostra 1000 caracteres
 
+    # Índice local sobre trechos e resumos: cada prompt recebe só o contexto relevante
+    context_index = BM25Index(java_snippets + summarized_chunks)
+
     # ===== Passo 3: Gerar arquivos do projeto =====
-    file_tasks = [
-        {"path": "project/src/main/java/com/example/MainApplication.java",
-         "prompt": f"Generate a Spring Boot MainApplication.java class using the following code:\n{summarized_code}"},
-        {"path": "project/src/main/java/com/example/controller/HelloController.java",
-         "prompt": f"Generate a REST controller HelloController.java using the following code:\n{summarized_code}"},
-        {"path": "project/pom.xml",
-         "prompt": f"Generate a Maven pom.xml file for a Spring Boot project using the following code:\n{summarized_code}"},
-        {"path": "project/README.md",
-         "prompt": f"Generate a README.md explaining how to build and run the project:\n{summarized_code}"}
-    ]
+    # Gerações em paralelo alimentam uma fila; o escritor grava cada arquivo assim que fica pronto
+    async def generate(task):
+        return await generate_file(task, context_index, model_client, tools)
+
+    return await generate_and_write(project_file_tasks(output_dir), generate, writer)
+
+async def main():
+    # Stack de agentes/MCP carregada só quando o script é executado
+    from autogen_ext.tools.mcp import StdioServerParams
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+    from mcp_session_pool import get_shared_pool
+    from rate_limited_client import RateLimitedChatCompletionClient
+
+    # MCP local
+    fetch_mcp_server = StdioServerParams(command="uvx", args=["mcp-server-fetch"])
+    tools = await get_shared_pool().tools(fetch_mcp_server)
+    model_client = RateLimitedChatCompletionClient(OpenAIChatCompletionClient(model="gpt-4.1-mini"))
+
+    url = "https://spring.io/guides/gs/spring-boot"
+
+    # --save-via-mcp grava pela ferramenta save_file de mcp_save_file.py
+    writer = SaveFileToolWriter() if "--save-via-mcp" in sys.argv else LocalFileWriter()
+    async with writer:
+        reports = await generate_project(url, model_client, tools, writer)
 
-    for task in file_tasks:
-        code = await agent.run(task=task["prompt"])
-        save_task = {
-            "method": "save_file",
-            "params": {"path": task["path"], "content": code},
-            "id": "1"
-        }
-        tools[0].send(save_task)  # tools[0] é o StdioServerParams tool client
-        print(f"Arquivo solicitado para geração: {task['path']}")
-
-    print("\n=== Todos os arquivos do projeto foram gerados! ===")
+    saved = sum(1 for report in reports if report["ok"])
+    print(f"\n=== {saved}/{len(reports)} arquivos do projeto gerados e salvos! ===")
 
 if __name__ == "__main__":
     asyncio.run(main())
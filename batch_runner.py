@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Executor em lote com checkpoints para rodar os pipelines sobre muitas entradas.
+
+Lê um manifesto (uma URL/repositório por linha, ou JSON por linha com
+"input" e opcionalmente "pipeline"), executa o pipeline escolhido com um
+pool de workers e grava o resultado de cada etapa em um checkpoint. Ao
+reiniciar, as etapas já concluídas são lidas do checkpoint em vez de
+refeitas, então uma falha no meio do lote não custa o lote inteiro de novo.
+
+Uso:
+    python batch_runner.py manifest.txt --pipeline fetch-and-summarize --workers 8
+    python batch_runner.py repos.txt --pipeline repo-analyze
+    python batch_runner.py guides.txt --pipeline project-generate --output-dir batch_output
+
+Pipelines:
+    fetch-and-summarize  fetch da página -> texto -> resumo map-reduce
+    repo-analyze         download do repositório -> análise da estrutura
+    project-generate     extração do código Java -> resumos -> geração de cada arquivo do projeto
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from tracing import span
+
+CHECKPOINT_DIR = ".checkpoints"
+OUTPUT_DIR = "batch_output"
+WORKERS = 4
+
+class CheckpointStore:
+    """
+    Guarda o resultado de cada etapa em `<dir>/<pipeline>/<hash da entrada>/<etapa>.json`.
+    As gravações são atômicas (arquivo temporário + os.replace), então um
+    crash nunca deixa um checkpoint pela metade.
+    """
+
+    def __init__(self, directory: str = CHECKPOINT_DIR):
+        self.directory = directory
+
+    def _path(self, pipeline: str, item: str, stage: str) -> str:
+        key = hashlib.sha256(item.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, pipeline, key, f"{stage}.json")
+
+    def get(self, pipeline: str, item: str, stage: str):
+        """Retorna (True, resultado) se a etapa já foi concluída, senão (False, None)."""
+        path = self._path(pipeline, item, stage)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return True, json.load(f)["result"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return False, None
+
+    def put(self, pipeline: str, item: str, stage: str, result) -> None:
+        path = self._path(pipeline, item, stage)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = {"input": item, "stage": stage, "completed_at": time.time(), "result": result}
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+class StageRunner:
+    """Executa as etapas de uma entrada, pulando as que já têm checkpoint."""
+
+    def __init__(self, store: CheckpointStore, pipeline: str, item: str):
+        self.store = store
+        self.pipeline = pipeline
+        self.item = item
+        self.resumed = []
+
+    async def stage(self, name: str, compute):
+        done, result = self.store.get(self.pipeline, self.item, name)
+        if done:
+            self.resumed.append(name)
+            return result
+        with span(f"batch.{name}", input=self.item):
+            result = await compute()
+        self.store.put(self.pipeline, self.item, name, result)
+        return result
+
+def _item_dir(output_dir: str, item: str) -> str:
+    return os.path.join(output_dir, hashlib.sha256(item.encode("utf-8")).hexdigest()[:16])
+
+# ===== Pipelines =====
+
+async def fetch_and_summarize(runner: StageRunner, context: dict) -> dict:
+    import requests
+    from bs4 import BeautifulSoup
+    from java_code_generator import summarize_guidelines
+
+    def fetch_text() -> str:
+        response = requests.get(runner.item, timeout=30)
+        response.raise_for_status()
+        return BeautifulSoup(response.text, "html.parser").get_text("\n", strip=True)
+
+    async def fetch():
+        return await asyncio.to_thread(fetch_text)
+
+    text = await runner.stage("fetch", fetch)
+
+    async def summarize():
+        return await summarize_guidelines(context["model_client"](), text)
+
+    summary = await runner.stage("summarize", summarize)
+    return {"chars": len(text), "summary": summary}
+
+async def repo_analyze(runner: StageRunner, context: dict) -> dict:
+    from github_project_downloader import analyze_project_structure
+    from simple_github_downloader import download_github_repo
+
+    async def download():
+        target = os.path.join(_item_dir(context["output_dir"], runner.item), "repo")
+        return await asyncio.to_thread(download_github_repo, runner.item, target)
+
+    project_path = await runner.stage("download", download)
+
+    async def analyze():
+        return await asyncio.to_thread(analyze_project_structure, project_path)
+
+    analysis = await runner.stage("analyze", analyze)
+    return {"path": project_path, "analysis": analysis}
+
+async def project_generate(runner: StageRunner, context: dict) -> dict:
+    from agent_java_parse_code import fetch_java_code, generate_file, project_file_tasks, summarize_snippets
+    from context_retriever import BM25Index
+    from project_writer import LocalFileWriter, generate_and_write
+
+    async def fetch():
+        return await fetch_java_code(runner.item)
+
+    java_snippets = await runner.stage("fetch", fetch)
+
+    async def summarize():
+        return await summarize_snippets(context["model_client"](), java_snippets)
+
+    summaries = await runner.stage("summarize", summarize)
+    context_index = BM25Index(java_snippets + summaries)
+
+    # Um checkpoint por arquivo: se um falhar, o próximo run gera só esse
+    output_dir = os.path.join(_item_dir(context["output_dir"], runner.item), "project")
+
+    async def generate(task):
+        async def compute():
+            return await generate_file(task, context_index, context["model_client"](), await context["tools"]())
+        return await runner.stage(f"generate.{os.path.basename(task['path'])}", compute)
+
+    async with LocalFileWriter() as writer:
+        reports = await generate_and_write(project_file_tasks(output_dir), generate, writer)
+    failed = [report["path"] for report in reports if not report["ok"]]
+    if failed:
+        raise RuntimeError(f"Falha ao gerar {len(failed)} arquivo(s): {', '.join(failed)}")
+    return {"files": [report["path"] for report in reports]}
+
+PIPELINES = {
+    "fetch-and-summarize": fetch_and_summarize,
+    "repo-analyze": repo_analyze,
+    "project-generate": project_generate,
+}
+
+# ===== Execução =====
+
+def read_manifest(path: str, default_pipeline: str) -> list[tuple[str, str]]:
+    """Lê o manifesto e retorna pares (pipeline, entrada), sem duplicatas."""
+    entries = []
+    seen = set()
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                entry = (record.get("pipeline", default_pipeline), record["input"])
+            else:
+                entry = (default_pipeline, line)
+            if entry[0] not in PIPELINES:
+                raise ValueError(f"{path}:{line_number}: pipeline desconhecido '{entry[0]}'")
+            if entry not in seen:
+                seen.add(entry)
+                entries.append(entry)
+    return entries
+
+def _lazy_model_client():
+    # O cliente é criado na primeira etapa que precisa do modelo e compartilhado
+    # por todos os workers, para que o rate limit valha para o lote inteiro
+    client = None
+
+    def get():
+        nonlocal client
+        if client is None:
+            from autogen_ext.models.openai import OpenAIChatCompletionClient
+            from rate_limited_client import RateLimitedChatCompletionClient
+            client = RateLimitedChatCompletionClient(OpenAIChatCompletionClient(model="gpt-4.1-mini"))
+        return client
+
+    return get
+
+def _pooled_tools(tools):
+    # Sem ferramentas explícitas, todas as entradas e workers do lote usam o pool
+    # compartilhado: o servidor de fetch sobe uma vez e a sessão fica aquecida
+    async def get():
+        if tools is not None:
+            return tools
+        from autogen_ext.tools.mcp import StdioServerParams
+        from mcp_session_pool import get_shared_pool
+        return await get_shared_pool().tools(StdioServerParams(command="uvx", args=["mcp-server-fetch"]))
+
+    return get
+
+async def run_batch(entries: list[tuple[str, str]], store: CheckpointStore, workers: int = WORKERS,
+                    output_dir: str = OUTPUT_DIR, model_client=None, tools: list = None) -> list[dict]:
+    """
+    Executa os pipelines sobre as entradas com até `workers` em paralelo.
+
+    Args:
+        entries: Pares (pipeline, entrada) lidos do manifesto
+        store: Onde ficam os checkpoints das etapas
+        workers: Entradas processadas ao mesmo tempo
+        output_dir: Diretório para repositórios baixados e projetos gerados
+        model_client: ChatCompletionClient compartilhado (padrão: OpenAI com rate limit)
+        tools: Ferramentas dos agentes de geração (padrão: mcp-server-fetch do pool compartilhado)
+
+    Returns:
+        Um registro por entrada com pipeline, input, ok, resumed, seconds e result ou error
+    """
+    context = {
+        "output_dir": output_dir,
+        "model_client": (lambda: model_client) if model_client is not None else _lazy_model_client(),
+        "tools": _pooled_tools(tools),
+    }
+    semaphore = asyncio.Semaphore(workers)
+    total = len(entries)
+    completed = 0
+
+    async def run_one(pipeline: str, item: str) -> dict:
+        nonlocal completed
+        async with semaphore:
+            runner = StageRunner(store, pipeline, item)
+            start = time.perf_counter()
+            record = {"pipeline": pipeline, "input": item}
+            try:
+                record["result"] = await PIPELINES[pipeline](runner, context)
+                record["ok"] = True
+            except Exception as e:
+                record["ok"] = False
+                record["error"] = f"{type(e).__name__}: {e}"
+            record["resumed"] = runner.resumed
+            record["seconds"] = time.perf_counter() - start
+            completed += 1
+            status = "✅" if record["ok"] else "❌"
+            resumed = f" (retomado: {', '.join(runner.resumed)})" if runner.resumed else ""
+            print(f"[{completed}/{total}] {status} {pipeline} {item}{resumed}"
+                  + ("" if record["ok"] else f" - {record['error']}"), flush=True)
+            return record
+
+    return await asyncio.gather(*(run_one(pipeline, item) for pipeline, item in entries))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", help="arquivo com uma entrada por linha (ou JSON por linha)")
+    parser.add_argument("--pipeline", choices=sorted(PIPELINES), default="fetch-and-summarize")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    options = parser.parse_args()
+
+    entries = read_manifest(options.manifest, options.pipeline)
+    print(f"📋 {len(entries)} entradas, {options.workers} workers, checkpoints em {options.checkpoint_dir}")
+
+    records = asyncio.run(run_batch(entries, CheckpointStore(options.checkpoint_dir),
+                                    options.workers, options.output_dir))
+
+    failed = [record for record in records if not record["ok"]]
+    print(f"\n✅ {len(records) - len(failed)} concluídas, ❌ {len(failed)} com falha")
+    if failed:
+        print("Execute novamente o mesmo comando para retomar as entradas com falha.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
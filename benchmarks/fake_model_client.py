@@ -0,0 +1,104 @@
+"""
+ChatCompletionClient falso com latência configurável, para rodar os
+pipelines sem OpenAI, e uma variante que responde 429 como o provedor.
+"""
+import asyncio
+import time
+from collections import deque
+from types import SimpleNamespace
+from autogen_core.models import ChatCompletionClient, CreateResult, ModelInfo, RequestUsage
+
+def _message_chars(messages) -> int:
+    total = 0
+    for message in messages:
+        content = getattr(message, "content", "")
+        total += len(content) if isinstance(content, str) else len(str(content))
+    return total
+
+class FakeChatCompletionClient(ChatCompletionClient):
+    """
+    Responde sempre com o mesmo texto depois de `latency` segundos.
+
+    O uso de tokens é estimado em ~4 caracteres por token para que os
+    contadores de custo e os orçamentos tenham valores realistas.
+    """
+
+    def __init__(self, latency: float = 0.05, response: str = "- ok", completion_tokens: int = None):
+        self.latency = latency
+        self.response = response
+        self.completion_tokens = completion_tokens if completion_tokens is not None else max(1, len(response) // 4)
+        self.calls = 0
+        self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._last_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    async def create(self, messages, *, tools=[], json_output=None, extra_create_args={},
+                     cancellation_token=None, **kwargs) -> CreateResult:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        usage = RequestUsage(prompt_tokens=self.count_tokens(messages), completion_tokens=self.completion_tokens)
+        self._last_usage = usage
+        self._total_usage = RequestUsage(
+            prompt_tokens=self._total_usage.prompt_tokens + usage.prompt_tokens,
+            completion_tokens=self._total_usage.completion_tokens + usage.completion_tokens,
+        )
+        return CreateResult(finish_reason="stop", content=self.response, usage=usage, cached=False)
+
+    async def create_stream(self, messages, *, tools=[], json_output=None, extra_create_args={},
+                            cancellation_token=None, **kwargs):
+        yield await self.create(messages, tools=tools, json_output=json_output,
+                                extra_create_args=extra_create_args, cancellation_token=cancellation_token)
+
+    async def close(self) -> None:
+        pass
+
+    def actual_usage(self) -> RequestUsage:
+        return self._last_usage
+
+    def total_usage(self) -> RequestUsage:
+        return self._total_usage
+
+    def count_tokens(self, messages, *, tools=[]) -> int:
+        return max(1, _message_chars(messages) // 4)
+
+    def remaining_tokens(self, messages, *, tools=[]) -> int:
+        return 128000 - self.count_tokens(messages)
+
+    @property
+    def capabilities(self):
+        return {"vision": False, "function_calling": True, "json_output": False}
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return {"vision": False, "function_calling": True, "json_output": False,
+                "family": "unknown", "structured_output": False}
+
+class FakeRateLimitError(Exception):
+    """Imita o openai.RateLimitError: status_code 429 e header Retry-After."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"429 Too Many Requests (retry after {retry_after:.2f}s)")
+        self.status_code = 429
+        self.response = SimpleNamespace(headers={"retry-after": f"{retry_after:.3f}"})
+
+class RateLimitingFakeClient(FakeChatCompletionClient):
+    """
+    Cliente falso que aplica um limite de requisições por janela e responde
+    429 (com Retry-After) quando ele é excedido, como a API da OpenAI.
+    """
+
+    def __init__(self, max_requests: int = 10, window: float = 1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.max_requests = max_requests
+        self.window = window
+        self.rejected = 0
+        self._accepted = deque()
+
+    async def create(self, messages, **kwargs) -> CreateResult:
+        now = time.monotonic()
+        while self._accepted and now - self._accepted[0] >= self.window:
+            self._accepted.popleft()
+        if len(self._accepted) >= self.max_requests:
+            self.rejected += 1
+            raise FakeRateLimitError(retry_after=self.window - (now - self._accepted[0]))
+        self._accepted.append(now)
+        return await super().create(messages, **kwargs)
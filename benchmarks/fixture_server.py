@@ -0,0 +1,152 @@
+"""
+Servidor HTTP local que substitui spring.io e GitHub nos benchmarks.
+
+Rotas (todas aceitam ?delay_ms=N, ou o atributo delay_ms do servidor, para
+simular latência de rede):
+    /pages/<arquivo>                        página gravada em benchmarks/fixtures/
+    /synthetic?kb=N                         página sintética com ~N KB de blocos Java
+    /<owner>/<repo>/archive/refs/heads/<branch>.zip
+                                            zip de repositório gerado na hora; o tamanho
+                                            vem de ?files=N&file_kb=M ou dos atributos
+                                            archive_files/archive_file_kb do servidor
+"""
+import io
+import os
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+JAVA_BLOCK = """<pre><code class="language-java">package com.example.demo{i};
+
+import org.springframework.web.bind.annotation.GetMapping;
+import org.springframework.web.bind.annotation.RestController;
+
+@RestController
+public class Demo{i}Controller {{
+
+	@GetMapping("/demo/{i}")
+	public String demo() {{
+		return "Demo {i}";
+	}}
+
+}}
+</code></pre>
+"""
+
+def synthetic_page(kb: int) -> bytes:
+    """Página HTML com blocos de código Java até somar ~kb kilobytes."""
+    parts = ["<html><body><main>"]
+    size = 0
+    i = 0
+    while size < kb * 1024:
+        block = f"<h2>Section {i}</h2><p>Lorem ipsum dolor sit amet.</p>" + JAVA_BLOCK.format(i=i)
+        parts.append(block)
+        size += len(block)
+        i += 1
+    parts.append("</main></body></html>")
+    return "".join(parts).encode("utf-8")
+
+def repo_archive(repo_name: str, branch: str, files: int, file_kb: int) -> bytes:
+    """Zip no formato do GitHub (<repo>-<branch>/...) com um projeto Spring Boot fictício."""
+    root = f"{repo_name}-{branch}"
+    body = ("// filler\n" * (file_kb * 1024 // 10))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(f"{root}/README.md", f"# {repo_name}\n\nProjeto de exemplo.\n")
+        archive.writestr(f"{root}/pom.xml", "<project><artifactId>demo</artifactId></project>\n")
+        archive.writestr(f"{root}/Dockerfile", "FROM eclipse-temurin:17\n")
+        archive.writestr(f"{root}/src/main/resources/application.properties", "server.port=8080\n")
+        for i in range(files):
+            package = f"com/example/module{i % 10}"
+            source = f"package com.example.module{i % 10};\n\npublic class Class{i} {{}}\n{body}"
+            archive.writestr(f"{root}/src/main/java/{package}/Class{i}.java", source)
+    return buffer.getvalue()
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split("/") if p]
+        server = self.server
+        delay_ms = int(query.get("delay_ms", server.delay_ms))
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+
+        if len(parts) == 2 and parts[0] == "pages":
+            path = os.path.join(FIXTURES_DIR, os.path.basename(parts[1]))
+            if not os.path.isfile(path):
+                return self._send(404, b"not found", "text/plain")
+            with open(path, "rb") as f:
+                return self._send(200, f.read(), "text/html; charset=utf-8")
+
+        if parts == ["synthetic"]:
+            return self._send(200, synthetic_page(int(query.get("kb", 64))), "text/html; charset=utf-8")
+
+        if len(parts) == 6 and parts[2:5] == ["archive", "refs", "heads"] and parts[5].endswith(".zip"):
+            branch = parts[5][:-len(".zip")]
+            if branch not in server.branches:
+                return self._send(404, b"not found", "text/plain")
+            files = int(query.get("files", server.archive_files))
+            file_kb = int(query.get("file_kb", server.archive_file_kb))
+            return self._send(200, repo_archive(parts[1], branch, files, file_kb), "application/zip")
+
+        self._send(404, b"not found", "text/plain")
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.server.requests_served += 1
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # sem log por requisição: o benchmark mede o tempo, não o terminal
+
+class FixtureServer:
+    """
+    Sobe o servidor de fixtures em uma thread, em uma porta livre.
+
+    Uso:
+        with FixtureServer(archive_files=200) as server:
+            requests.get(f"{server.base_url}/pages/spring-boot-guide.html")
+    """
+
+    def __init__(self, archive_files: int = 50, archive_file_kb: int = 2, branches=("main",)):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.archive_files = archive_files
+        self._httpd.archive_file_kb = archive_file_kb
+        self._httpd.branches = set(branches)
+        self._httpd.requests_served = 0
+        self._httpd.delay_ms = 0
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def delay_ms(self) -> int:
+        return self._httpd.delay_ms
+
+    @delay_ms.setter
+    def delay_ms(self, value: int) -> None:
+        self._httpd.delay_ms = value
+
+    @property
+    def requests_served(self) -> int:
+        return self._httpd.requests_served
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._httpd.shutdown()
+        self._httpd.server_close()
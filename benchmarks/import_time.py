@@ -0,0 +1,83 @@
+"""
+Benchmark de tempo de import (custo cumulativo por módulo).
+
+Usa `python -X importtime` em um processo novo para cada medição, então o
+resultado é o custo real de inicialização do script. Os servidores stdio são
+iniciados a cada sessão, por isso o import deles está no caminho crítico de
+toda execução de agente.
+
+Uso:
+    python -m benchmarks.import_time                 # todos os entry points
+    python -m benchmarks.import_time mcp_local --top 15
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from benchmarks.stdio_driver import REPO_DIR
+
+ENTRY_POINTS = [
+    "mcp_local",
+    "mcp_fetch_url",
+    "mcp_save_file",
+    "main",
+    "agent_v2",
+    "github_downloader",
+    "github_project_downloader",
+    "simple_github_downloader",
+    "java_parser_code",
+    "agent_java_parse_code",
+    "java_code_generator",
+    "batch_runner",
+]
+
+def import_profile(module: str) -> tuple[float, dict]:
+    """
+    Importa `module` em um processo novo.
+
+    Returns:
+        (custo cumulativo em segundos, {import direto do módulo: cumulativo em segundos})
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               cwd=REPO_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    children = {}
+    for line in completed.stderr.splitlines():
+        # import time:  self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, package = line[len("import time:"):].split("|")
+        # O recuo indica a profundidade; os filhos aparecem antes do pai
+        depth = (len(package) - len(package.lstrip()) - 1) // 2
+        name = package.strip()
+        if depth == 1:
+            children[name] = int(cumulative) / 1e6
+        elif depth == 0:
+            if name == module:
+                return int(cumulative) / 1e6, children
+            children = {}
+    raise RuntimeError(f"{module} não aparece no -X importtime (já importado?)")
+
+def import_cost(module: str) -> float:
+    """Custo cumulativo (segundos) do import de `module` em um processo novo."""
+    return import_profile(module)[0]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="mostra os N imports diretos mais caros de cada módulo")
+    options = parser.parse_args()
+
+    print(f"{'módulo':<30}{'p50 ms':>10}{'min ms':>10}")
+    for module in options.modules:
+        samples = [import_cost(module) * 1000 for _ in range(options.runs)]
+        print(f"{module:<30}{statistics.median(samples):>10.1f}{min(samples):>10.1f}")
+        if options.top:
+            _, children = import_profile(module)
+            for name, cost in sorted(children.items(), key=lambda item: -item[1])[:options.top]:
+                print(f"    {name:<40}{cost * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
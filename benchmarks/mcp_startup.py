@@ -0,0 +1,65 @@
+"""
+Benchmark de latência de inicialização dos servidores MCP.
+
+Compara o caminho a frio (um processo novo + descoberta de ferramentas a cada
+execução, como os scripts faziam) com o pool de sessões aquecidas.
+
+Uso:
+    python -m benchmarks.mcp_startup --runs 5
+    python -m benchmarks.mcp_startup --command python --args mcp_local.py
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from autogen_ext.tools.mcp import StdioServerParams, mcp_server_tools
+from mcp_session_pool import McpSessionPool, resolve_server_params
+
+def _report(label: str, samples: list[float]) -> None:
+    samples_ms = sorted(s * 1000 for s in samples)
+    p50 = statistics.median(samples_ms)
+    print(f"{label:<28} n={len(samples_ms):<3} p50={p50:8.1f} ms  min={samples_ms[0]:8.1f} ms  max={samples_ms[-1]:8.1f} ms")
+
+async def run(params: StdioServerParams, runs: int) -> None:
+    cold = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await mcp_server_tools(params)
+        cold.append(time.perf_counter() - start)
+
+    resolved = resolve_server_params(params)
+    cold_resolved = []
+    if resolved is not params:
+        for _ in range(runs):
+            start = time.perf_counter()
+            await mcp_server_tools(resolved)
+            cold_resolved.append(time.perf_counter() - start)
+
+    async with McpSessionPool(health_check_interval=0) as pool:
+        start = time.perf_counter()
+        await pool.tools(params)
+        first = time.perf_counter() - start
+
+        warm = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            await pool.tools(params)
+            warm.append(time.perf_counter() - start)
+
+    print(f"Servidor: {params.command} {' '.join(params.args)}")
+    _report("cold (spawn + discovery)", cold)
+    if cold_resolved:
+        _report("cold sem resolução uvx", cold_resolved)
+    _report("pool: primeira chamada", [first])
+    _report("pool: sessão aquecida", warm)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--command", default="uvx")
+    parser.add_argument("--args", nargs="*", default=["mcp-server-fetch"])
+    parser.add_argument("--runs", type=int, default=5)
+    options = parser.parse_args()
+    asyncio.run(run(StdioServerParams(command=options.command, args=options.args), options.runs))
+
+if __name__ == "__main__":
+    main()
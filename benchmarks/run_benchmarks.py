@@ -0,0 +1,319 @@
+"""
+Suite de benchmarks offline (sem spring.io, GitHub ou OpenAI).
+
+Cada caso roda em um subprocesso próprio para que o pico de RSS seja do
+caso e não da suite. Os resultados (throughput, p50/p99 e pico de RSS) são
+comparados com um baseline salvo; uma regressão acima da tolerância faz o
+comando sair com código 1.
+
+Uso:
+    python -m benchmarks.run_benchmarks                    # todos os casos
+    python -m benchmarks.run_benchmarks --case fetch_java_code
+    python -m benchmarks.run_benchmarks --save-baseline    # grava benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --tolerance 0.3
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.fixture_server import FixtureServer
+from benchmarks.stdio_driver import REPO_DIR, round_trips
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+PAGE = "/pages/spring-boot-guide.html"
+
+CASES = {}
+
+def case(name: str):
+    """Registra uma função `fn(ctx) -> list[float]` (latência por operação) como caso."""
+    def register(fn):
+        CASES[name] = fn
+        return fn
+    return register
+
+# ===== Servidores stdio =====
+
+@case("fetch_server_mcp_local")
+def bench_mcp_local(ctx):
+    url = ctx["base_url"] + PAGE
+    return asyncio.run(round_trips("mcp_local.py", "fetch_url", lambda i: {"url": url}, requests=50, concurrency=4))
+
+@case("fetch_server_mcp_fetch_url")
+def bench_mcp_fetch_url(ctx):
+    url = ctx["base_url"] + PAGE
+    return asyncio.run(round_trips("mcp_fetch_url.py", "fetch_url", lambda i: {"url": url}, requests=50, concurrency=4))
+
+@case("save_file_server")
+def bench_save_file(ctx):
+    content = "x" * 16 * 1024
+    params_for = lambda i: {"path": os.path.join(ctx["workdir"], f"saved/{i % 20}/File{i}.java"), "content": content}
+    return asyncio.run(round_trips("mcp_save_file.py", "save_file", params_for, requests=200, concurrency=4))
+
+@case("fetch_server_coalesced")
+def bench_fetch_coalesced(ctx):
+    # Muitos agentes pedindo a mesma página ao mesmo tempo: o servidor deve fazer poucas requisições HTTP
+    url = ctx["base_url"] + PAGE + "?delay_ms=200"
+    stats = {}
+    latencies = asyncio.run(round_trips("mcp_local.py", "fetch_url", lambda i: {"url": url},
+                                        requests=32, concurrency=32, stats=stats))
+    if not stats.get("fetch_url", {}).get("coalesced"):
+        raise RuntimeError(f"Nenhuma chamada agrupada: {stats}")
+    return latencies
+
+# ===== Download e análise de repositórios =====
+
+@case("download_github_repo")
+def bench_download_github_repo(ctx):
+    from simple_github_downloader import download_github_repo
+    latencies = []
+    for i in range(10):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            download_github_repo("https://github.com/example/demo-repo",
+                                 os.path.join(ctx["workdir"], f"repo{i}"), base_url=ctx["base_url"])
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+@case("download_github_repo_coalesced")
+def bench_download_coalesced(ctx):
+    from concurrent.futures import ThreadPoolExecutor
+    from simple_github_downloader import download_github_repo
+    from single_flight import all_stats
+
+    def one(_) -> float:
+        start = time.perf_counter()
+        download_github_repo("https://github.com/example/demo-repo", os.path.join(ctx["workdir"], "shared"),
+                             base_url=ctx["base_url"])
+        return time.perf_counter() - start
+
+    ctx["server"].delay_ms = 200
+
+    with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(max_workers=8) as executor:
+        latencies = list(executor.map(one, range(8)))
+    if not all_stats()["download_github_repo"]["coalesced"]:
+        raise RuntimeError(f"Nenhum download agrupado: {all_stats()}")
+    return latencies
+
+@case("analyze_project_comprehensive")
+def bench_analyze_project(ctx):
+    from simple_github_downloader import analyze_project_comprehensive, download_github_repo
+    with contextlib.redirect_stdout(io.StringIO()):
+        project_path = download_github_repo("https://github.com/example/demo-repo",
+                                            os.path.join(ctx["workdir"], "repo"), base_url=ctx["base_url"])
+    latencies = []
+    for _ in range(20):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyze_project_comprehensive(project_path)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+# ===== Extração de código Java =====
+
+@case("fetch_java_code")
+def bench_fetch_java_code(ctx):
+    from java_parser_code import fetch_java_code
+    url = ctx["base_url"] + PAGE
+    latencies = []
+    for _ in range(30):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fetch_java_code(url)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+# ===== Pipelines de agentes (modelo falso) =====
+
+@case("pipeline_java_code_generator")
+def bench_pipeline_java_code_generator(ctx):
+    import requests
+    from benchmarks.fake_model_client import FakeChatCompletionClient
+    from java_code_generator import generate_code, summarize_guidelines
+
+    async def run_once() -> float:
+        model_client = FakeChatCompletionClient(latency=ctx["model_latency"], response="- guideline\n" * 20)
+        start = time.perf_counter()
+        content = requests.get(f"{ctx['base_url']}/synthetic?kb=256", timeout=30).text
+        guidelines = await summarize_guidelines(model_client, content)
+        await generate_code(model_client, guidelines)
+        return time.perf_counter() - start
+
+    return [asyncio.run(run_once()) for _ in range(3)]
+
+@case("pipeline_agent_java_parse_code")
+def bench_pipeline_agent_java_parse_code(ctx):
+    from agent_java_parse_code import generate_project
+    from benchmarks.fake_model_client import FakeChatCompletionClient
+    from project_writer import LocalFileWriter
+
+    async def run_once(i: int) -> float:
+        model_client = FakeChatCompletionClient(latency=ctx["model_latency"], response="public class Generated {}\n" * 40)
+        start = time.perf_counter()
+        async with LocalFileWriter() as writer:
+            reports = await generate_project(ctx["base_url"] + PAGE, model_client, [], writer,
+                                             output_dir=os.path.join(ctx["workdir"], f"project{i}"))
+        if not all(report["ok"] for report in reports):
+            raise RuntimeError(f"Falha ao gravar arquivos: {reports}")
+        return time.perf_counter() - start
+
+    latencies = []
+    for i in range(3):
+        with contextlib.redirect_stdout(io.StringIO()):
+            latencies.append(asyncio.run(run_once(i)))
+    return latencies
+
+@case("rate_limited_client")
+def bench_rate_limited_client(ctx):
+    from autogen_core.models import UserMessage
+    from benchmarks.fake_model_client import RateLimitingFakeClient
+    from rate_limited_client import RateLimitedChatCompletionClient
+
+    async def run() -> list[float]:
+        # Provedor aceita 20 req/s; o agendador não conhece o limite e precisa se adaptar aos 429
+        provider = RateLimitingFakeClient(max_requests=20, window=1.0, latency=ctx["model_latency"])
+        client = RateLimitedChatCompletionClient(provider, rpm=100000, tpm=10_000_000,
+                                                 initial_concurrency=16, max_concurrency=64)
+        latencies = []
+
+        async def one(i: int) -> None:
+            start = time.perf_counter()
+            await client.create([UserMessage(content=f"request {i}", source="user")])
+            latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one(i) for i in range(200)))
+        # O cooldown compartilhado deve manter os 429 raros (antes: ~2,8 rejeições por chamada)
+        if provider.rejected > len(latencies) // 10:
+            raise RuntimeError(f"{provider.rejected} rejeições (429) para {len(latencies)} chamadas")
+        return latencies
+
+    return asyncio.run(run())
+
+# ===== Tempo de import =====
+
+def _import_case(module: str):
+    def bench(ctx):
+        from benchmarks.import_time import import_cost
+        return [import_cost(module) for _ in range(5)]
+    return bench
+
+# Servidores stdio (iniciados a cada sessão) e os entry points dos pipelines
+for _module in ("mcp_local", "mcp_fetch_url", "mcp_save_file",
+                "agent_java_parse_code", "java_code_generator", "github_project_downloader"):
+    case(f"import_{_module}")(_import_case(_module))
+
+# ===== Execução e relatório =====
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Percentil pelo método nearest-rank."""
+    ordered = sorted(samples)
+    rank = max(1, round(pct / 100 * len(ordered) + 0.5 - 1e-9))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def peak_rss_mb() -> float:
+    # ru_maxrss em KB no Linux; inclui os processos filhos (servidores stdio)
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / 1024
+
+def run_case_inline(name: str, model_latency: float) -> dict:
+    with tempfile.TemporaryDirectory() as workdir, FixtureServer() as server:
+        ctx = {"base_url": server.base_url, "server": server, "workdir": workdir, "model_latency": model_latency}
+        start = time.perf_counter()
+        latencies = CASES[name](ctx)
+        wall = time.perf_counter() - start
+    return {
+        "ops": len(latencies),
+        "throughput_ops_s": len(latencies) / wall if wall else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def run_case_subprocess(name: str, model_latency: float) -> dict:
+    command = [sys.executable, "-m", "benchmarks.run_benchmarks", "--case", name, "--inline",
+               "--model-latency", str(model_latency)]
+    completed = subprocess.run(command, cwd=REPO_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"error": (completed.stderr.strip().splitlines() or ["erro desconhecido"])[-1]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Lista as métricas que pioraram mais que a tolerância em relação ao baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or "error" in result or "error" in base:
+            continue
+        for metric in ("p50_ms", "peak_rss_mb"):
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {base[metric]:.1f} -> {result[metric]:.1f}")
+        if result["throughput_ops_s"] < base["throughput_ops_s"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput_ops_s {base['throughput_ops_s']:.2f} -> {result['throughput_ops_s']:.2f}")
+    return regressions
+
+def print_table(results: dict, baseline: dict) -> None:
+    print(f"{'caso':<34}{'ops':>5}{'ops/s':>10}{'p50 ms':>11}{'p99 ms':>11}{'RSS MB':>9}{'Δp50':>9}")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<34}  ❌ {result['error']}")
+            continue
+        base = baseline.get(name)
+        delta = ""
+        if base and "error" not in base and base["p50_ms"]:
+            delta = f"{(result['p50_ms'] / base['p50_ms'] - 1) * 100:+.0f}%"
+        print(f"{name:<34}{result['ops']:>5}{result['throughput_ops_s']:>10.2f}{result['p50_ms']:>11.1f}"
+              f"{result['p99_ms']:>11.1f}{result['peak_rss_mb']:>9.1f}{delta:>9}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="caso a executar (repetível)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como novo baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--model-latency", type=float, default=0.05, help="latência do modelo falso (s)")
+    parser.add_argument("--inline", action="store_true", help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.inline:
+        print(json.dumps(run_case_inline(options.case[0], options.model_latency)))
+        return
+
+    names = options.case or list(CASES)
+    results = {}
+    for name in names:
+        print(f"⏱️  {name}...", flush=True)
+        results[name] = run_case_subprocess(name, options.model_latency)
+
+    baseline = {}
+    if os.path.exists(options.baseline):
+        with open(options.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print()
+    print_table(results, baseline)
+
+    if options.save_baseline:
+        with open(options.baseline, "w", encoding="utf-8") as f:
+            json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+        print(f"\n💾 Baseline salvo em {options.baseline}")
+        return
+
+    failed = [name for name, result in results.items() if "error" in result]
+    regressions = compare(results, baseline, options.tolerance) if baseline else []
+    if not baseline:
+        print("\nℹ️ Nenhum baseline encontrado; use --save-baseline para criar um.")
+    for regression in regressions:
+        print(f"📉 Regressão: {regression}")
+    if failed or regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Driver de ida e volta para os servidores stdio (`mcp_local.py`,
+`mcp_fetch_url.py`, `mcp_save_file.py`).
+"""
+import asyncio
+import os
+import sys
+import time
+from stdio_rpc_client import StdioJsonRpcClient
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+async def round_trips(script: str, method: str, params_for, requests: int, concurrency: int = 1,
+                      stats: dict = None) -> list[float]:
+    """
+    Inicia `script` e mede a latência de `requests` chamadas JSON-RPC.
+
+    Args:
+        script: Servidor stdio do repositório (ex.: "mcp_local.py")
+        method: Método chamado em cada requisição
+        params_for: Função `params_for(i) -> dict` com os parâmetros da i-ésima chamada
+        requests: Número de chamadas
+        concurrency: Chamadas em voo ao mesmo tempo
+        stats: Se informado, recebe os contadores do método "stats" do servidor ao final
+
+    Returns:
+        Latência de cada chamada em segundos
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with StdioJsonRpcClient(sys.executable, [os.path.join(REPO_DIR, script)]) as client:
+        async def one(i: int) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                await client.call(method, params_for(i), timeout=60)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        if stats is not None:
+            stats.update(await client.call("stats", timeout=10))
+    return latencies
@@ -0,0 +1,84 @@
+"""
+Recuperação local de contexto (BM25) para prompts de geração.
+
+Em vez de colar todo o contexto em cada prompt, indexa os trechos
+extraídos e seus resumos e escolhe apenas os mais relevantes para cada
+arquivo gerado, respeitando um orçamento de tokens por prompt.
+"""
+import math
+import re
+from collections import Counter
+from token_counter import count_tokens
+
+TOP_K = 4
+PROMPT_CONTEXT_TOKENS = 1500
+
+_WORD_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z0-9]+|[A-Z]+|\d+")
+
+def tokenize(text: str) -> list[str]:
+    """Quebra o texto em termos minúsculos, separando camelCase e snake_case."""
+    return [term.lower() for term in _WORD_RE.findall(text)]
+
+class BM25Index:
+    """Índice BM25 em memória sobre uma lista de documentos de texto."""
+
+    def __init__(self, documents: list[str], k1: float = 1.5, b: float = 0.75):
+        self.documents = list(documents)
+        self.k1 = k1
+        self.b = b
+        self._term_freqs = [Counter(tokenize(doc)) for doc in self.documents]
+        self._lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+        doc_freqs = Counter()
+        for tf in self._term_freqs:
+            doc_freqs.update(tf.keys())
+        n = len(self.documents)
+        self._idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in doc_freqs.items()
+        }
+
+    def scores(self, query: str) -> list[float]:
+        """Retorna a pontuação BM25 de cada documento para a consulta."""
+        query_terms = set(tokenize(query))
+        results = []
+        for tf, length in zip(self._term_freqs, self._lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_length) if self._avg_length else self.k1
+            for term in query_terms:
+                freq = tf.get(term)
+                if freq:
+                    score += self._idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            results.append(score)
+        return results
+
+    def search(self, query: str, top_k: int = TOP_K) -> list[tuple[int, float]]:
+        """Retorna (índice, pontuação) dos top_k documentos com pontuação positiva."""
+        ranked = sorted(enumerate(self.scores(query)), key=lambda item: item[1], reverse=True)
+        return [(i, score) for i, score in ranked[:top_k] if score > 0]
+
+def select_context(index: BM25Index, query: str, top_k: int = TOP_K,
+                   max_tokens: int = PROMPT_CONTEXT_TOKENS) -> str:
+    """
+    Monta o contexto de um prompt com os documentos mais relevantes.
+
+    Args:
+        index: Índice construído sobre trechos e resumos
+        query: Descrição do arquivo a ser gerado
+        top_k: Número máximo de documentos incluídos
+        max_tokens: Orçamento de tokens do contexto
+
+    Returns:
+        Documentos selecionados, em ordem de relevância, separados por linha em branco
+    """
+    selected = []
+    used = 0
+    for i, _ in index.search(query, top_k):
+        doc = index.documents[i]
+        doc_tokens = count_tokens(doc)
+        if used + doc_tokens > max_tokens:
+            continue
+        selected.append(doc)
+        used += doc_tokens
+    return "\n\n".join(selected)
@@ -2,18 +2,21 @@
 # uv tool install mcp-server-fetch
 # verify it in path by running uv tool update-shell
 import asyncio
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_ext.tools.mcp import StdioServerParams, mcp_server_tools
-from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
-from autogen_core import CancellationToken
-from autogen_agentchat.ui import Console
 
 async def main() -> None:
+    # Imports pesados dentro de main: importar o módulo não carrega a stack de agentes
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+    from autogen_ext.tools.mcp import StdioServerParams
+    from mcp_session_pool import get_shared_pool
+    from autogen_agentchat.agents import AssistantAgent
+    from autogen_agentchat.teams import RoundRobinGroupChat
+    from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
+    from autogen_core import CancellationToken
+    from autogen_agentchat.ui import Console
+
     # Setup server params for local filesystem access
     fetch_mcp_server = StdioServerParams(command="uvx", args=["mcp-server-fetch"])
-    tools = await mcp_server_tools(fetch_mcp_server)
+    tools = await get_shared_pool().tools(fetch_mcp_server)
 
     # Create an agent that can use the fetch tool.
     model_client = OpenAIChatCompletionClient(model="gpt-4.1-mini")
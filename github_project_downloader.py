@@ -2,17 +2,10 @@
 # uv tool install mcp-server-fetch
 import asyncio
 import os
-import requests
+import sys
 import zipfile
 import tempfile
 from pathlib import Path
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_ext.tools.mcp import StdioServerParams, mcp_server_tools
-from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
-from autogen_core import CancellationToken
-from autogen_agentchat.ui import Console
 
 def analyze_project_structure(project_path: str) -> str:
     """
@@ -79,6 +72,8 @@ def download_github_repo(repo_url: str, download_path: str = "./downloaded_repos
     Returns:
         Path to the extracted repository
     """
+    import requests
+    
     # Extract owner and repo name from URL
     parts = repo_url.rstrip('/').split('/')
     owner = parts[-2]
@@ -132,12 +127,27 @@ async def main() -> None:
         print(f"❌ Erro ao baixar o repositório: {e}")
         return
     
+    # --download-only skips the AI analysis (and never imports the agent stack)
+    if "--download-only" in sys.argv:
+        return
+    
+    # The agent stack is only loaded after the download-only part succeeded
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+    from autogen_ext.tools.mcp import StdioServerParams
+    from autogen_agentchat.agents import AssistantAgent
+    from autogen_agentchat.teams import RoundRobinGroupChat
+    from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
+    from autogen_core import CancellationToken
+    from autogen_agentchat.ui import Console
+    from mcp_session_pool import get_shared_pool
+    from rate_limited_client import RateLimitedChatCompletionClient
+    
     # Setup MCP server with fetch capabilities for additional analysis
     fetch_mcp_server = StdioServerParams(command="uvx", args=["mcp-server-fetch"])
-    tools = await mcp_server_tools(fetch_mcp_server)
+    tools = await get_shared_pool().tools(fetch_mcp_server)
 
     # Create an agent that can use fetch tools for additional research
-    model_client = OpenAIChatCompletionClient(model="gpt-4.1-mini")
+    model_client = RateLimitedChatCompletionClient(OpenAIChatCompletionClient(model="gpt-4.1-mini"))
     agent = AssistantAgent(
         name="project_analyzer", 
         model_client=model_client, 
@@ -0,0 +1,113 @@
+"""
+Resumo hierárquico (map-reduce) para documentos longos.
+
+Os chunks são resumidos em paralelo (map) e os resumos são combinados em
+uma árvore com fan-in limitado (reduce) até caberem no orçamento de tokens.
+A latência cresce com log(tamanho do documento) e o prompt final tem
+tamanho previsível.
+"""
+import asyncio
+from token_counter import DEFAULT_MODEL, chunk_by_tokens, count_tokens
+from tracing import span
+
+CHUNK_TOKENS = 4000     # tamanho de cada chunk na fase map
+TARGET_TOKENS = 3000    # orçamento do texto final
+FAN_IN = 4              # quantos resumos são combinados por chamada de reduce
+MAX_CONCURRENCY = 8     # chamadas simultâneas ao modelo
+
+MAP_PROMPT = "Summarize the following text in concise bullet points:"
+REDUCE_PROMPT = "Merge the following partial summaries into one concise list of bullet points, removing duplicates:"
+
+def task_result_text(result) -> str:
+    """Extrai o texto da última mensagem de um TaskResult (ou de um CreateResult)."""
+    messages = getattr(result, "messages", None)
+    if messages:
+        result = messages[-1]
+    content = getattr(result, "content", result)
+    return content if isinstance(content, str) else str(content)
+
+def _summarizer(model_client, max_concurrency: int):
+    """Chamada sem estado ao modelo (`prompt` + conteúdo), limitada a `max_concurrency` simultâneas."""
+    from autogen_core.models import UserMessage
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def summarize(stage: str, prompt: str, content: str) -> str:
+        async with semaphore:
+            with span(stage) as s:
+                result = await model_client.create([UserMessage(content=f"{prompt}\n{content}", source="user")])
+                s.record_usage(result)
+        return task_result_text(result)
+
+    return summarize
+
+async def summarize_each(
+    model_client,
+    texts: list[str],
+    prompt: str = MAP_PROMPT,
+    max_concurrency: int = MAX_CONCURRENCY,
+) -> list[str]:
+    """
+    Resume cada texto com uma chamada independente, em paralelo.
+
+    Cada prompt leva só o próprio texto (nada de histórico de conversa), então o
+    custo cresce linearmente com o número de textos.
+
+    Returns:
+        Um resumo por texto, na mesma ordem
+    """
+    summarize = _summarizer(model_client, max_concurrency)
+    return list(await asyncio.gather(*(summarize("summarize", prompt, text) for text in texts)))
+
+async def summarize_map_reduce(
+    model_client,
+    text: str,
+    map_prompt: str = MAP_PROMPT,
+    reduce_prompt: str = REDUCE_PROMPT,
+    chunk_tokens: int = CHUNK_TOKENS,
+    target_tokens: int = TARGET_TOKENS,
+    fan_in: int = FAN_IN,
+    max_concurrency: int = MAX_CONCURRENCY,
+    model: str = DEFAULT_MODEL,
+) -> str:
+    """
+    Resume um texto longo em paralelo e reduz os resumos em árvore.
+
+    Args:
+        model_client: ChatCompletionClient usado nas chamadas (sem estado de conversa)
+        text: Documento a ser resumido
+        map_prompt: Instrução aplicada a cada chunk
+        reduce_prompt: Instrução aplicada a cada grupo de resumos
+        chunk_tokens: Tamanho máximo de cada chunk na fase map
+        target_tokens: Orçamento de tokens do resultado final
+        fan_in: Número de resumos combinados por chamada de reduce (>= 2)
+        max_concurrency: Limite de chamadas simultâneas ao modelo
+
+    Returns:
+        Resumo final com no máximo ~target_tokens tokens
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in deve ser >= 2")
+
+    summarize = _summarizer(model_client, max_concurrency)
+
+    with span("chunk") as s:
+        chunks = chunk_by_tokens(text, chunk_tokens, model)
+        s.set(chunks=len(chunks))
+    if not chunks:
+        return ""
+
+    # Map: todos os chunks em paralelo
+    summaries = await asyncio.gather(*(summarize("summarize.map", map_prompt, chunk) for chunk in chunks))
+
+    # Reduce: cada nível divide o número de resumos por fan_in
+    while len(summaries) > 1 and count_tokens("\n".join(summaries), model) > target_tokens:
+        groups = [summaries[i:i + fan_in] for i in range(0, len(summaries), fan_in)]
+        summaries = await asyncio.gather(*(summarize("summarize.reduce", reduce_prompt, "\n".join(group))
+                                           for group in groups))
+
+    # Um único resumo ainda acima do orçamento recebe uma última compressão
+    if len(summaries) == 1 and count_tokens(summaries[0], model) > target_tokens:
+        summaries = [await summarize("summarize.reduce", reduce_prompt, summaries[0])]
+
+    return "\n".join(summaries)
@@ -1,57 +1,80 @@
 import asyncio
-from autogen_ext.tools.mcp import StdioServerParams, mcp_server_tools
-from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.openai import OpenAIChatCompletionClient
+from hierarchical_summarizer import summarize_map_reduce, task_result_text
+from tracing import span
 
-CHUNK_SIZE = 4000  # tokens aproximados
+CHUNK_SIZE = 4000  # tokens por chunk na fase map
+GUIDELINES_TOKENS = 3000  # orçamento das diretrizes resumidas no prompt final
 
-async def chunk_text(text, size=CHUNK_SIZE):
-    """Divide o texto em chunks menores"""
-    chunks = []
-    for i in range(0, len(text), size):
-        chunks.append(text[i:i+size])
-    return chunks
+async def summarize_guidelines(model_client, architecture_content: str) -> str:
+    """Resume as diretrizes com map-reduce em paralelo até caberem no orçamento."""
+    return await summarize_map_reduce(
+        model_client,
+        architecture_content,
+        map_prompt="Summarize the following architecture guidelines in concise bullet points:",
+        chunk_tokens=CHUNK_SIZE,
+        target_tokens=GUIDELINES_TOKENS,
+    )
+
+async def generate_code(model_client, summarized_guidelines: str) -> str:
+    """
+    Gera o projeto Spring Boot a partir das diretrizes resumidas.
+
+    Usa um agente novo, sem histórico: o agente do fetch guarda a página inteira
+    no contexto e a reenviaria no prompt final.
+    """
+    from autogen_agentchat.agents import AssistantAgent
+    agent = AssistantAgent(name="code_generator", model_client=model_client)
+    code_task = f"""
+Using the following architecture guidelines, generate a complete Java Spring Boot project with:
+- MVC structure
+- Entities, Repositories, Services, Controllers
+- Basic validation and exception handling
+- README and build instructions
+
+Architecture Guidelines:
+{summarized_guidelines}
+"""
+    with span("generate") as s:
+        result = await agent.run(task=code_task)
+        s.record_usage(result)
+    return task_result_text(result)
 
 async def main():
+    # Stack de agentes/MCP carregada só aqui: summarize_guidelines e generate_code
+    # podem ser importados (batch_runner, benchmarks) sem esse custo
+    from autogen_ext.tools.mcp import StdioServerParams
+    from mcp_session_pool import get_shared_pool
+    from autogen_agentchat.agents import AssistantAgent
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+    from rate_limited_client import RateLimitedChatCompletionClient
+
     # MCP local
     server_params = StdioServerParams(command="python", args=["mcp_local.py"])
-    tools = await mcp_server_tools(server_params)
+    tools = await get_shared_pool().tools(server_params)
 
     # Agente
+    model_client = RateLimitedChatCompletionClient(OpenAIChatCompletionClient(model="gpt-4.1-mini"))
     agent = AssistantAgent(
         name="architect_agent",
-        model_client=OpenAIChatCompletionClient(model="gpt-4.1-mini"),
+        model_client=model_client,
         tools=tools
     )
 
     # ===== Passo 1: Buscar diretrizes do site =====
     fetch_task = "Fetch URL https://refactoring.guru/design-patterns/java using fetch_url tool"
-    architecture_content = await agent.run(task=fetch_task)
-
-    # ===== Passo 2: Chunking e resumo =====
-    chunks = await chunk_text(architecture_content, size=4000)
-    summarized_chunks = []
-    for chunk in chunks:
-        summary_task = f"Summarize the following architecture guidelines in concise bullet points:\n{chunk}"
-        summary = await agent.run(task=summary_task)
-        summarized_chunks.append(summary)
+    with span("fetch") as s:
+        result = await agent.run(task=fetch_task)
+        s.record_usage(result)
+        architecture_content = task_result_text(result)
+        s.set(bytes=len(architecture_content.encode("utf-8")))
 
-    summarized_guidelines = "\n".join(summarized_chunks)
+    # ===== Passo 2: Chunking e resumo hierárquico (map-reduce em paralelo) =====
+    summarized_guidelines = await summarize_guidelines(model_client, architecture_content)
     print("\n=== Diretrizes resumidas ===")
     print(summarized_guidelines[:1000])  # mostra 1000 caracteres
 
     # ===== Passo 3: Gerar projeto Spring Boot =====
-    code_task = f"""
-Using the following architecture guidelines, generate a complete Java Spring Boot project with:
-- MVC structure
-- Entities, Repositories, Services, Controllers
-- Basic validation and exception handling
-- README and build instructions
-
-Architecture Guidelines:
-{summarized_guidelines}
-"""
-    generated_code = await agent.run(task=code_task)
+    generated_code = await generate_code(model_client, summarized_guidelines)
     print("\n=== Código gerado pelo agente (exemplo parcial) ===")
     print(generated_code[:1500])  # mostra apenas parte do código
 
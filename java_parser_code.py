@@ -1,10 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
-
 def fetch_java_code(url: str) -> list[str]:
     """
     Acessa a URL, parseia HTML e retorna uma lista de trechos de código Java.
     """
+    # Imports pesados só quando o fetch é usado (is_likely_java_code não precisa deles)
+    import requests
+    from bs4 import BeautifulSoup
+
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
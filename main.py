@@ -1,12 +1,15 @@
 import asyncio
-from autogen_ext.tools.mcp import StdioServerParams, mcp_server_tools
-from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.openai import OpenAIChatCompletionClient
 
 async def main():
+    # Imports pesados dentro de main: importar o módulo não carrega a stack de agentes
+    from autogen_ext.tools.mcp import StdioServerParams
+    from mcp_session_pool import get_shared_pool
+    from autogen_agentchat.agents import AssistantAgent
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+
     # MCP local
     server_params = StdioServerParams(command="python", args=["mcp_local.py"])
-    tools = await mcp_server_tools(server_params)
+    tools = await get_shared_pool().tools(server_params)
 
     # Agente
     agent = AssistantAgent(
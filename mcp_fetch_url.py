@@ -1,5 +1,14 @@
 #!/usr/bin/env python3
-import sys, json, requests
+import sys, json
+from single_flight import FetchDispatcher, all_stats
+
+def _get_text(url):
+    import requests  # só no primeiro fetch: não pesa na inicialização do servidor
+    r = requests.get(url, timeout=5)
+    return r.text
+
+_dispatcher = FetchDispatcher(_get_text, lambda url, e: f"Erro: {e}")
+respond = _dispatcher.respond
 
 def main():
     # Verifica se há argumentos da linha de comando
@@ -8,8 +17,7 @@ def main():
         if sys.argv[1] == "fetch_url" and len(sys.argv) > 2:
             url = sys.argv[2]
             try:
-                r = requests.get(url, timeout=5)
-                print(r.text)
+                print(_get_text(url))
             except Exception as e:
                 print(f"Erro: {e}")
         else:
@@ -29,20 +37,19 @@ def main():
             rpc_id = request.get("id")
 
             if method == "fetch_url":
-                url = params.get("url")
-                try:
-                    r = requests.get(url, timeout=5)
-                    result = r.text
-                except Exception as e:
-                    result = f"Erro: {e}"
+                _dispatcher.submit(params.get("url"), rpc_id)
+                continue
+            elif method == "stats":
+                result = all_stats()
             else:
                 result = f"Método {method} não suportado."
 
-            response = {"jsonrpc":"2.0","id":rpc_id,"result":result}
-            print(json.dumps(response), flush=True)
+            respond({"jsonrpc":"2.0","id":rpc_id,"result":result})
         except Exception as e:
             error_response = {"jsonrpc": "2.0","id": None, "error": str(e)}
-            print(json.dumps(error_response), flush=True)
+            respond(error_response)
+
+    _dispatcher.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
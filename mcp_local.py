@@ -1,4 +1,13 @@
-import sys, json, requests
+import sys, json
+from single_flight import FetchDispatcher, all_stats
+
+def _get_text(url):
+    import requests  # só no primeiro fetch: não pesa na inicialização do servidor
+    r = requests.get(url, timeout=5)
+    return r.text  # retorna o conteúdo completo
+
+_dispatcher = FetchDispatcher(_get_text, lambda url, e: f"Erro: {e}")
+respond = _dispatcher.respond
 
 def main():
     while True:
@@ -13,20 +22,19 @@ def main():
             rpc_id = request.get("id")
 
             if method == "fetch_url":
-                url = params.get("url")
-                try:
-                    r = requests.get(url, timeout=5)
-                    result = r.text  # retorna o conteúdo completo
-                except Exception as e:
-                    result = f"Erro: {e}"
+                _dispatcher.submit(params.get("url"), rpc_id)
+                continue
+            elif method == "stats":
+                result = all_stats()
             else:
                 result = f"Método {method} não suportado."
 
-            response = {"jsonrpc":"2.0","id":rpc_id,"result":result}
-            print(json.dumps(response), flush=True)
+            respond({"jsonrpc":"2.0","id":rpc_id,"result":result})
         except Exception as e:
             error_response = {"jsonrpc": "2.0","id": None, "error": str(e)}
-            print(json.dumps(error_response), flush=True)
+            respond(error_response)
+
+    _dispatcher.close()
 
 if __name__ == "__main__":
     main()
@@ -1,19 +1,21 @@
 #!/usr/bin/env python3
 import sys
 import json
-import requests
 import os
+from single_flight import FetchDispatcher, all_stats
+
+def fetch_text(url):
+    import requests  # save_file não precisa de requests: só carrega no primeiro fetch
+    response = requests.get(url, timeout=15)
+    response.raise_for_status()
+    return response.text
+
+_dispatcher = FetchDispatcher(fetch_text, lambda url, e: f"Erro ao acessar URL {url}: {e}")
 
 def process_request(method, params, rpc_id):
     result = None
     if method == "fetch_url":
-        url = params.get("url")
-        try:
-            response = requests.get(url, timeout=15)
-            response.raise_for_status()
-            result = response.text
-        except Exception as e:
-            result = f"Erro ao acessar URL {url}: {e}"
+        result = _dispatcher.fetch(params.get("url"))
 
     elif method == "save_file":
         path = params.get("path")
@@ -26,11 +28,13 @@ def process_request(method, params, rpc_id):
         except Exception as e:
             result = f"Erro ao salvar arquivo {path}: {e}"
 
+    elif method == "stats":
+        result = all_stats()
+
     else:
         result = f"Método {method} não suportado."
 
-    response_json = {"jsonrpc": "2.0", "id": rpc_id, "result": result}
-    print(json.dumps(response_json), flush=True)
+    _dispatcher.respond({"jsonrpc": "2.0", "id": rpc_id, "result": result})
 
 def main():
     # Se houver argumento de linha de comando, faz fetch direto
@@ -50,10 +54,15 @@ def main():
             method = request.get("method")
             params = request.get("params", {})
             rpc_id = request.get("id")
-            process_request(method, params, rpc_id)
+            if method == "fetch_url":
+                _dispatcher.submit(params.get("url"), rpc_id)
+            else:
+                process_request(method, params, rpc_id)
         except Exception as e:
             error_response = {"jsonrpc": "2.0", "id": None, "error": str(e)}
-            print(json.dumps(error_response), flush=True)
+            _dispatcher.respond(error_response)
+
+    _dispatcher.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,244 @@
+"""
+Pool de sessões MCP de longa duração compartilhadas entre pipelines.
+
+Cada servidor stdio (`uvx mcp-server-fetch`, `python mcp_local.py`, ...) é
+iniciado uma única vez e mantido aquecido. Os schemas das ferramentas são
+descobertos uma vez por servidor e reutilizados; as sessões passam por
+health-check periódico e são reiniciadas quando morrem. Vários agentes
+podem usar as mesmas sessões ao mesmo tempo (o MCP multiplexa as
+requisições por id).
+"""
+import asyncio
+import itertools
+import shutil
+import weakref
+import anyio
+from autogen_ext.tools.mcp import StdioMcpToolAdapter, StdioServerParams, create_mcp_server_session
+
+POOL_SIZE = 1                   # sessões por servidor
+HEALTH_CHECK_INTERVAL = 30.0    # segundos entre pings
+PING_TIMEOUT = 5.0
+
+_shared_pools = weakref.WeakKeyDictionary()   # event loop -> McpSessionPool
+
+def resolve_server_params(params: StdioServerParams) -> StdioServerParams:
+    """
+    Evita a resolução a frio do `uvx` quando a ferramenta já está instalada
+    com `uv tool install` (ex.: `uvx mcp-server-fetch` -> `mcp-server-fetch`).
+    """
+    if params.command == "uvx" and params.args:
+        installed = shutil.which(params.args[0])
+        if installed:
+            return params.model_copy(update={"command": installed, "args": list(params.args[1:])})
+    return params
+
+# Erros de transporte de uma sessão cujo processo morreu
+_SESSION_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, ConnectionError)
+
+def _server_key(params: StdioServerParams) -> tuple:
+    env = tuple(sorted((params.env or {}).items()))
+    return (params.command, tuple(params.args), env)
+
+class _Worker:
+    """Uma sessão MCP mantida aberta por uma task dedicada."""
+
+    def __init__(self, params: StdioServerParams):
+        self.params = params
+        self.session = None
+        self.error = None
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        # O contexto stdio precisa entrar e sair na mesma task, por isso a sessão vive em _run
+        self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    async def _run(self) -> None:
+        try:
+            async with create_mcp_server_session(self.params) as session:
+                await session.initialize()
+                self.session = session
+                self._ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def ping(self, timeout: float = PING_TIMEOUT) -> None:
+        await asyncio.wait_for(self.session.send_ping(), timeout)
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+
+class _PooledToolAdapter(StdioMcpToolAdapter):
+    """
+    Ferramenta que busca a sessão no pool a cada chamada, em vez de guardar a
+    sessão de quando foi criada: depois de um restart (health-check ou erro de
+    transporte) os agentes que já têm a ferramenta passam a usar o novo processo.
+    """
+
+    def __init__(self, pool: "McpSessionPool", key: tuple, index: int, server_params: StdioServerParams, tool):
+        super().__init__(server_params=server_params, tool=tool)
+        self._pool = pool
+        self._key = key
+        self._index = index
+
+    async def run(self, args, cancellation_token):
+        kwargs = args.model_dump(exclude_unset=True)
+        worker = await self._pool._live_worker(self._key, self._index)
+        try:
+            return await self._run(args=kwargs, cancellation_token=cancellation_token, session=worker.session)
+        except _SESSION_ERRORS as e:
+            # O processo morreu entre dois health-checks: reinicia e tenta uma vez mais
+            print(f"⚠️ Sessão MCP {self._key[0]} encerrada ({type(e).__name__}), reiniciando...")
+            worker = await self._pool._replace_worker(self._key, self._index, worker)
+            return await self._run(args=kwargs, cancellation_token=cancellation_token, session=worker.session)
+
+class McpSessionPool:
+    """
+    Mantém sessões MCP aquecidas e entrega ferramentas ligadas a elas.
+
+    Uso:
+        async with McpSessionPool() as pool:
+            tools = await pool.tools(StdioServerParams(command="uvx", args=["mcp-server-fetch"]))
+    """
+
+    def __init__(self, size: int = POOL_SIZE, health_check_interval: float = HEALTH_CHECK_INTERVAL):
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self._workers = {}      # chave do servidor -> lista de _Worker
+        self._schemas = {}      # chave do servidor -> lista de mcp.types.Tool
+        self._cycles = {}       # chave do servidor -> round-robin dos índices
+        self._locks = {}
+        self._health_task = None
+        self.restarts = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def tools(self, params: StdioServerParams) -> list:
+        """Retorna as ferramentas do servidor ligadas a uma sessão aquecida do pool."""
+        params = resolve_server_params(params)
+        key = _server_key(params)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            workers = self._workers.get(key)
+            if workers is None:
+                started = await asyncio.gather(*(self._start_worker(params) for _ in range(self.size)),
+                                               return_exceptions=True)
+                errors = [w for w in started if isinstance(w, BaseException)]
+                if errors:
+                    await asyncio.gather(*(w.stop() for w in started if isinstance(w, _Worker)))
+                    raise errors[0]
+                self._workers[key] = list(started)
+                self._cycles[key] = itertools.cycle(range(self.size))
+            index = next(self._cycles[key])
+            worker = self._workers[key][index]
+            if not worker.alive:
+                worker = await self._restart(key, index)
+            if key not in self._schemas:
+                self._schemas[key] = (await worker.session.list_tools()).tools
+        self._ensure_health_checks()
+        return [_PooledToolAdapter(self, key, index, server_params=params, tool=tool)
+                for tool in self._schemas[key]]
+
+    def _current_worker(self, key: tuple, index: int) -> _Worker:
+        workers = self._workers.get(key)
+        if workers is None:
+            raise RuntimeError("Pool de sessões MCP já foi encerrado")
+        return workers[index]
+
+    async def _live_worker(self, key: tuple, index: int) -> _Worker:
+        """Worker atual da posição `index`, reiniciado se a sessão tiver terminado."""
+        worker = self._current_worker(key, index)
+        if worker.alive:
+            return worker
+        return await self._replace_worker(key, index, worker)
+
+    async def _replace_worker(self, key: tuple, index: int, dead: _Worker) -> _Worker:
+        """Reinicia `dead`, a menos que outra chamada (ou o health-check) já tenha reiniciado."""
+        async with self._locks[key]:
+            worker = self._current_worker(key, index)
+            if worker is dead:
+                worker = await self._restart(key, index)
+            return worker
+
+    async def _start_worker(self, params: StdioServerParams) -> _Worker:
+        worker = _Worker(params)
+        await worker.start()
+        return worker
+
+    async def _restart(self, key: tuple, index: int) -> _Worker:
+        old = self._workers[key][index]
+        await old.stop()
+        worker = await self._start_worker(old.params)
+        self._workers[key][index] = worker
+        self.restarts += 1
+        return worker
+
+    def _ensure_health_checks(self) -> None:
+        if self.health_check_interval and (self._health_task is None or self._health_task.done()):
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await self.check_health()
+
+    async def check_health(self) -> None:
+        """Faz ping em todas as sessões e reinicia as que não respondem."""
+        for key, workers in list(self._workers.items()):
+            for index, worker in enumerate(list(workers)):
+                try:
+                    if not worker.alive:
+                        raise ConnectionError("sessão encerrada")
+                    await worker.ping()
+                except Exception as e:
+                    print(f"⚠️ Sessão MCP {key[0]} não respondeu ({e}), reiniciando...")
+                    async with self._locks[key]:
+                        try:
+                            await self._restart(key, index)
+                        except Exception as restart_error:
+                            print(f"❌ Falha ao reiniciar sessão MCP {key[0]}: {restart_error}")
+
+    async def close(self) -> None:
+        """Encerra o health-check e todos os processos dos servidores."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        workers = [w for ws in self._workers.values() for w in ws]
+        self._workers.clear()
+        self._cycles.clear()
+        await asyncio.gather(*(w.stop() for w in workers), return_exceptions=True)
+
+def get_shared_pool() -> McpSessionPool:
+    """
+    Pool compartilhado pelo event loop atual: todos os agentes e pipelines do
+    mesmo processo reutilizam os mesmos servidores aquecidos. As sessões são
+    encerradas quando o loop termina (asyncio.run cancela as tasks pendentes).
+    """
+    loop = asyncio.get_running_loop()
+    pool = _shared_pools.get(loop)
+    if pool is None:
+        pool = McpSessionPool()
+        _shared_pools[loop] = pool
+    return pool
@@ -0,0 +1,122 @@
+"""
+Pipeline produtor/consumidor para gerar e gravar arquivos de projeto.
+
+As tarefas de geração rodam em paralelo e colocam cada arquivo pronto em uma
+fila limitada; um escritor drena a fila enquanto as outras gerações ainda
+estão em andamento, confirma cada gravação e registra os tempos por arquivo.
+Assim o I/O de disco/ferramenta se sobrepõe à latência do modelo.
+"""
+import asyncio
+import os
+import sys
+import time
+from stdio_rpc_client import StdioJsonRpcClient
+from tracing import span
+
+QUEUE_SIZE = 4
+MAX_CONCURRENCY = 4
+SAVED_PREFIX = "Arquivo salvo:"
+
+def _write_file(path: str, content: str) -> str:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return f"{SAVED_PREFIX} {path}"
+
+class LocalFileWriter:
+    """Grava os arquivos diretamente no disco (em uma thread)."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def write(self, path: str, content: str) -> str:
+        return await asyncio.to_thread(_write_file, path, content)
+
+class SaveFileToolWriter:
+    """Grava os arquivos pela ferramenta `save_file` do servidor `mcp_save_file.py`."""
+
+    def __init__(self, command: str = sys.executable, args: list[str] = None):
+        self._client = StdioJsonRpcClient(command, args or ["mcp_save_file.py"])
+
+    async def __aenter__(self):
+        await self._client.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.close()
+
+    async def write(self, path: str, content: str) -> str:
+        with span("tool.save_file", path=path) as s:
+            s.add("tool_calls")
+            return await self._client.call("save_file", {"path": path, "content": content})
+
+async def generate_and_write(file_tasks: list[dict], generate, writer,
+                             queue_size: int = QUEUE_SIZE,
+                             max_concurrency: int = MAX_CONCURRENCY) -> list[dict]:
+    """
+    Gera os arquivos em paralelo e grava cada um assim que fica pronto.
+
+    Args:
+        file_tasks: Tarefas com pelo menos a chave "path"
+        generate: Corrotina `generate(task) -> str` que produz o conteúdo do arquivo
+        writer: Objeto com `async write(path, content) -> str` (ex.: LocalFileWriter)
+        queue_size: Capacidade da fila entre geração e gravação
+        max_concurrency: Gerações simultâneas
+
+    Returns:
+        Um relatório por arquivo com path, ok, message e tempos em segundos
+        (generate_s, queue_wait_s, write_s, total_s)
+    """
+    queue = asyncio.Queue(maxsize=queue_size)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    reports = []
+    start = time.perf_counter()
+
+    async def produce(task: dict) -> None:
+        report = {"path": task["path"], "ok": False}
+        try:
+            async with semaphore:
+                t0 = time.perf_counter()
+                content = await generate(task)
+                report["generate_s"] = time.perf_counter() - t0
+        except Exception as e:
+            report["message"] = f"Erro ao gerar {task['path']}: {e}"
+            reports.append(report)
+            print(f"❌ {report['message']}")
+            return
+        report["queued_at"] = time.perf_counter()
+        await queue.put((task, content, report))
+
+    async def consume() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            task, content, report = item
+            t0 = time.perf_counter()
+            report["queue_wait_s"] = t0 - report.pop("queued_at")
+            try:
+                with span("save", path=task["path"], bytes=len(content.encode("utf-8"))):
+                    message = await writer.write(task["path"], content)
+                report["ok"] = isinstance(message, str) and message.startswith(SAVED_PREFIX)
+                report["message"] = message
+            except Exception as e:
+                report["message"] = f"Erro ao salvar {task['path']}: {e}"
+            report["write_s"] = time.perf_counter() - t0
+            report["total_s"] = time.perf_counter() - start
+            reports.append(report)
+            status = "✅" if report["ok"] else "❌"
+            print(f"{status} {task['path']} (geração {report['generate_s']:.2f}s, gravação {report['write_s'] * 1000:.0f}ms)")
+
+    consumer = asyncio.create_task(consume())
+    try:
+        await asyncio.gather(*(produce(task) for task in file_tasks))
+    finally:
+        await queue.put(None)
+        await consumer
+    return reports
@@ -0,0 +1,293 @@
+"""
+Agendador sensível a rate limit para chamadas ao modelo.
+
+`RateLimitedChatCompletionClient` envolve qualquer ChatCompletionClient
+(ex.: OpenAIChatCompletionClient) e:
+- estima os tokens do prompt antes da chamada (tiktoken);
+- aplica token buckets de requisições/minuto (RPM) e tokens/minuto (TPM);
+- em erro 429 suspende todas as admissões até o Retry-After expirar (cooldown
+  compartilhado) e cada chamada repete com backoff exponencial + jitter;
+- ajusta a taxa de requisições e a concorrência (AIMD): sobem devagar enquanto
+  tudo dá certo e caem pela metade no máximo uma vez por janela de backoff,
+  convergindo para o máximo sustentável.
+"""
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from autogen_core.models import ChatCompletionClient
+from token_counter import count_tokens
+
+DEFAULT_RPM = int(os.environ.get("OPENAI_RPM_LIMIT", 500))
+DEFAULT_TPM = int(os.environ.get("OPENAI_TPM_LIMIT", 200000))
+INITIAL_CONCURRENCY = 4
+MAX_CONCURRENCY = 32
+MAX_RETRIES = 6
+BACKOFF_BASE = 1.0      # segundos
+BACKOFF_CAP = 60.0
+EXPECTED_COMPLETION_TOKENS = 512
+DECREASE_FACTOR = 0.8    # a taxa cai a partir da taxa aceita pelo provedor, não da configurada
+RATE_WINDOW = 10.0      # segundos usados para medir a taxa de sucesso observada
+
+class TokenBucket:
+    """Bucket reabastecido continuamente a `per_minute` unidades por minuto."""
+
+    def __init__(self, per_minute: float, capacity: float = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._changed = asyncio.Event()   # sinalizado por adjust()/set_rate()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float) -> None:
+        # O lock mantém a ordem de chegada; só o primeiro da fila espera o saldo
+        async with self._lock:
+            while True:
+                self._refill()
+                # Pedidos maiores que a capacidade esperariam para sempre: limita à capacidade
+                needed = min(amount, self.capacity)
+                if self.tokens >= needed:
+                    self.tokens -= needed
+                    return
+                # Acorda antes do tempo calculado se um reembolso ou mudança de taxa chegar
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), (needed - self.tokens) / self.rate)
+                except asyncio.TimeoutError:
+                    pass
+
+    def set_rate(self, per_minute: float, capacity: float = None) -> None:
+        """Muda a taxa (e a capacidade); o saldo atual nunca passa da nova capacidade."""
+        self._refill()
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = min(self.tokens, self.capacity)
+        self._changed.set()
+
+    def adjust(self, delta: float) -> None:
+        """Corrige a estimativa com o uso real (delta > 0 devolve, < 0 cobra)."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + delta)
+        self._changed.set()
+
+class AdaptiveLimiter:
+    """Limite de chamadas simultâneas com aumento aditivo e redução multiplicativa."""
+
+    def __init__(self, initial: int = INITIAL_CONCURRENCY, maximum: int = MAX_CONCURRENCY):
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def on_rate_limited(self) -> None:
+        self.limit = max(1.0, self.limit / 2)
+
+def _is_rate_limited(error: Exception) -> bool:
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+def _retry_after(error: Exception) -> float:
+    """Lê Retry-After (segundos ou data HTTP) ou retry-after-ms dos headers do erro."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        pass
+    return 0.0
+
+def _estimate_prompt_tokens(messages, model: str) -> int:
+    total = 0
+    for message in messages:
+        content = getattr(message, "content", "")
+        total += count_tokens(content if isinstance(content, str) else str(content), model) + 4
+    return total
+
+class RateLimitedChatCompletionClient(ChatCompletionClient):
+    """
+    Envolve um ChatCompletionClient com limites de RPM/TPM, retry em 429 e
+    concorrência adaptativa. Pode ser passado a um AssistantAgent no lugar do
+    cliente original.
+
+    Uso:
+        model_client = RateLimitedChatCompletionClient(OpenAIChatCompletionClient(model="gpt-4.1-mini"))
+    """
+
+    def __init__(self, client: ChatCompletionClient, rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM,
+                 initial_concurrency: int = INITIAL_CONCURRENCY, max_concurrency: int = MAX_CONCURRENCY,
+                 max_retries: int = MAX_RETRIES, model: str = None,
+                 expected_completion_tokens: int = EXPECTED_COMPLETION_TOKENS):
+        self._client = client
+        self._rpm = rpm
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self._limiter = AdaptiveLimiter(initial_concurrency, max_concurrency)
+        self._cooldown_until = 0.0      # nenhuma admissão antes deste instante (monotonic)
+        self._last_decrease = 0.0       # 429 de chamadas admitidas antes disso já foram tratados
+        self._successes = deque()       # instantes dos sucessos recentes, para medir a taxa real
+        self._started = None
+        self.max_retries = max_retries
+        self.model = model or getattr(client, "_create_args", {}).get("model", "gpt-4.1-mini")
+        self.expected_completion_tokens = expected_completion_tokens
+        self.stats = {"requests": 0, "rate_limited": 0, "retries": 0, "decreases": 0}
+
+    @property
+    def concurrency(self) -> float:
+        return self._limiter.limit
+
+    @property
+    def request_rate(self) -> float:
+        """Taxa de requisições permitida no momento, em requisições por minuto."""
+        return self._requests.rate * 60
+
+    def _estimate(self, messages, extra_create_args) -> int:
+        completion = extra_create_args.get("max_tokens") or extra_create_args.get("max_completion_tokens") \
+            or self.expected_completion_tokens
+        return _estimate_prompt_tokens(messages, self.model) + completion
+
+    async def _wait_cooldown(self) -> None:
+        while True:
+            delay = self._cooldown_until - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def _admit(self, estimate: int) -> float:
+        """
+        Espera cooldown e buckets; retorna o instante da admissão. Chamado já com
+        a vaga de concorrência, logo antes do envio, para que um cooldown aberto
+        enquanto a chamada esperava na fila também valha para ela.
+        """
+        if self._started is None:
+            self._started = time.monotonic()
+        await self._wait_cooldown()
+        await self._requests.acquire(1)
+        await self._tokens.acquire(estimate)
+        # Um 429 pode ter aberto um cooldown enquanto esta chamada esperava os buckets
+        await self._wait_cooldown()
+        return time.monotonic()
+
+    def _observed_rate(self, now: float) -> float:
+        """Sucessos por segundo nos últimos RATE_WINDOW segundos (mínimo de 1 s de janela)."""
+        while self._successes and now - self._successes[0] > RATE_WINDOW:
+            self._successes.popleft()
+        window = max(1.0, min(RATE_WINDOW, now - self._started))
+        return len(self._successes) / window
+
+    def _on_success(self) -> None:
+        self._limiter.on_success()
+        self._successes.append(time.monotonic())
+        # Aumento aditivo: ~1 requisição/s a mais por segundo de sucessos, até o RPM configurado
+        rate = self._requests.rate
+        if rate * 60 < self._rpm:
+            per_second = min(self._rpm / 60.0, rate + 1.0 / max(rate, 1.0))
+            capacity = None if per_second * 60 >= self._rpm else max(1.0, per_second)
+            self._requests.set_rate(per_second * 60, capacity)
+
+    def _on_rate_limited(self, admitted_at: float, retry_after: float) -> None:
+        now = time.monotonic()
+        # Cooldown compartilhado: ninguém é admitido antes do Retry-After
+        self._cooldown_until = max(self._cooldown_until, now + retry_after)
+        if admitted_at < self._last_decrease:
+            return  # mesmo surto de 429 já tratado: reduz no máximo uma vez por janela
+        self._last_decrease = max(now, self._cooldown_until)
+        self.stats["decreases"] += 1
+        self._limiter.on_rate_limited()
+        # Redução multiplicativa da taxa a partir do que o provedor realmente aceitou,
+        # com burst de 1 s para não despejar um minuto de créditos ao fim do cooldown
+        observed = self._observed_rate(now)
+        per_second = max(1.0 / 60, min(self._requests.rate, observed or self._requests.rate) * DECREASE_FACTOR)
+        self._requests.set_rate(per_second * 60, capacity=max(1.0, per_second))
+        self._requests.tokens = 0.0
+
+    async def create(self, messages, *, tools=[], json_output=None, extra_create_args={},
+                     cancellation_token=None, **kwargs):
+        estimate = self._estimate(messages, extra_create_args)
+        for attempt in range(self.max_retries + 1):
+            admitted_at = time.monotonic()
+            try:
+                async with self._limiter:
+                    admitted_at = await self._admit(estimate)
+                    self.stats["requests"] += 1
+                    result = await self._client.create(messages, tools=tools, json_output=json_output,
+                                                       extra_create_args=extra_create_args,
+                                                       cancellation_token=cancellation_token, **kwargs)
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+                self.stats["rate_limited"] += 1
+                self.stats["retries"] += 1
+                retry_after = _retry_after(e)
+                self._on_rate_limited(admitted_at, retry_after)
+                if not retry_after:
+                    # Sem Retry-After: full jitter por chamada. Com ele, o cooldown
+                    # compartilhado e o bucket (já reduzido) espaçam as repetições
+                    await asyncio.sleep(random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)))
+                continue
+            self._on_success()
+            usage = getattr(result, "usage", None)
+            if usage is not None:
+                self._tokens.adjust(estimate - (usage.prompt_tokens + usage.completion_tokens))
+            return result
+
+    async def create_stream(self, messages, *, tools=[], json_output=None, extra_create_args={},
+                            cancellation_token=None, **kwargs):
+        # Streams não são repetidos: um 429 no meio da resposta sobe para o chamador
+        async with self._limiter:
+            await self._admit(self._estimate(messages, extra_create_args))
+            self.stats["requests"] += 1
+            async for chunk in self._client.create_stream(messages, tools=tools, json_output=json_output,
+                                                          extra_create_args=extra_create_args,
+                                                          cancellation_token=cancellation_token, **kwargs):
+                yield chunk
+        self._on_success()
+
+    async def close(self) -> None:
+        await self._client.close()
+
+    def actual_usage(self):
+        return self._client.actual_usage()
+
+    def total_usage(self):
+        return self._client.total_usage()
+
+    def count_tokens(self, messages, *, tools=[]) -> int:
+        return self._client.count_tokens(messages, tools=tools)
+
+    def remaining_tokens(self, messages, *, tools=[]) -> int:
+        return self._client.remaining_tokens(messages, tools=tools)
+
+    @property
+    def capabilities(self):
+        return self._client.capabilities
+
+    @property
+    def model_info(self):
+        return self._client.model_info
@@ -1,21 +1,36 @@
 # pip install requests
 import os
-import requests
 import zipfile
 import tempfile
 from pathlib import Path
+from single_flight import SingleFlight
 
-def download_github_repo(repo_url: str, download_path: str = "./downloaded_repos") -> str:
+# Concurrent callers asking for the same repository/project share one operation
+_downloads = SingleFlight("download_github_repo")
+_analyses = SingleFlight("analyze_project_comprehensive")
+
+def download_github_repo(repo_url: str, download_path: str = "./downloaded_repos",
+                         base_url: str = "https://github.com") -> str:
     """
     Download a GitHub repository as ZIP and extract it.
     
+    Concurrent calls for the same repository and destination wait on a single
+    download and share its result.
+    
     Args:
         repo_url: GitHub repository URL (e.g., https://github.com/zsantana/spring-boot-mcp-server)
         download_path: Local path to extract the repository
+        base_url: Host serving the archives (a local fixture server in benchmarks)
         
     Returns:
         Path to the extracted repository
     """
+    key = (repo_url.rstrip('/'), os.path.abspath(download_path), base_url)
+    return _downloads.do(key, _download_github_repo, repo_url, download_path, base_url)
+
+def _download_github_repo(repo_url: str, download_path: str, base_url: str) -> str:
+    import requests  # only the download path needs it, not the analysis
+    
     # Extract owner and repo name from URL
     parts = repo_url.rstrip('/').split('/')
     owner = parts[-2]
@@ -26,7 +41,7 @@ def download_github_repo(repo_url: str, download_path: str = "./downloaded_repos
     
     for branch in branches:
         # GitHub ZIP download URL
-        zip_url = f"https://github.com/{owner}/{repo_name}/archive/refs/heads/{branch}.zip"
+        zip_url = f"{base_url}/{owner}/{repo_name}/archive/refs/heads/{branch}.zip"
         
         # Create download directory
         os.makedirs(download_path, exist_ok=True)
@@ -81,16 +96,15 @@ def read_file_safely(file_path: str, max_chars: int = 2000) -> str:
     
     return f"❌ Não foi possível ler o arquivo {file_path}"
 
-def analyze_project_comprehensive(project_path: str) -> None:
-    """
-    Comprehensive analysis of the downloaded project.
-    """
-    print(f"\n🔍 ANÁLISE DETALHADA DO PROJETO")
-    print("=" * 50)
+def _build_analysis_report(project_path: str) -> str:
+    """Build the comprehensive analysis text of a project."""
+    lines = []
+    lines.append(f"\n🔍 ANÁLISE DETALHADA DO PROJETO")
+    lines.append("=" * 50)
     
     project_name = os.path.basename(project_path)
-    print(f"📁 Projeto: {project_name}")
-    print(f"📍 Localização: {project_path}")
+    lines.append(f"📁 Projeto: {project_name}")
+    lines.append(f"📍 Localização: {project_path}")
     
     # Key files to analyze in detail
     key_files = {
@@ -107,8 +121,8 @@ def analyze_project_comprehensive(project_path: str) -> None:
         'application.yml': '⚙️ Spring Boot Config'
     }
     
-    print(f"\n🔍 ARQUIVOS CHAVE ENCONTRADOS:")
-    print("-" * 30)
+    lines.append(f"\n🔍 ARQUIVOS CHAVE ENCONTRADOS:")
+    lines.append("-" * 30)
     
     found_files = []
     for root, dirs, files in os.walk(project_path):
@@ -119,28 +133,28 @@ def analyze_project_comprehensive(project_path: str) -> None:
                 found_files.append((relative_path, file, file_path))
                 
                 icon_desc = key_files.get(file, '📄')
-                print(f"  {icon_desc} {relative_path}")
+                lines.append(f"  {icon_desc} {relative_path}")
     
     # Read and display content of key files
-    print(f"\n📄 CONTEÚDO DOS ARQUIVOS PRINCIPAIS:")
-    print("-" * 40)
+    lines.append(f"\n📄 CONTEÚDO DOS ARQUIVOS PRINCIPAIS:")
+    lines.append("-" * 40)
     
     for relative_path, filename, full_path in found_files:
-        print(f"\n📄 {relative_path}:")
-        print("─" * (len(relative_path) + 4))
+        lines.append(f"\n📄 {relative_path}:")
+        lines.append("─" * (len(relative_path) + 4))
         content = read_file_safely(full_path)
-        print(content)
-        print()
+        lines.append(content)
+        lines.append("")
     
     # Analyze source code structure
-    print(f"\n🏗️ ESTRUTURA DO CÓDIGO FONTE:")
-    print("-" * 30)
+    lines.append(f"\n🏗️ ESTRUTURA DO CÓDIGO FONTE:")
+    lines.append("-" * 30)
     
     source_dirs = ['src', 'lib', 'app', 'backend', 'frontend']
     for source_dir in source_dirs:
         source_path = os.path.join(project_path, source_dir)
         if os.path.exists(source_path):
-            print(f"\n📂 {source_dir}/")
+            lines.append(f"\n📂 {source_dir}/")
             for root, dirs, files in os.walk(source_path):
                 level = root.replace(source_path, '').count(os.sep)
                 if level > 3:  # Limit depth
@@ -148,7 +162,7 @@ def analyze_project_comprehensive(project_path: str) -> None:
                 indent = '  ' * level
                 folder_name = os.path.basename(root)
                 if folder_name:
-                    print(f"{indent}📁 {folder_name}/")
+                    lines.append(f"{indent}📁 {folder_name}/")
                 
                 # Show relevant source files
                 sub_indent = '  ' * (level + 1)
@@ -156,13 +170,13 @@ def analyze_project_comprehensive(project_path: str) -> None:
                 source_files = [f for f in files if any(f.endswith(ext) for ext in relevant_extensions)]
                 
                 for file in source_files[:5]:  # Show max 5 files per directory
-                    print(f"{sub_indent}📄 {file}")
+                    lines.append(f"{sub_indent}📄 {file}")
                 if len(source_files) > 5:
-                    print(f"{sub_indent}... e mais {len(source_files) - 5} arquivos")
+                    lines.append(f"{sub_indent}... e mais {len(source_files) - 5} arquivos")
     
     # Technology detection
-    print(f"\n🛠️ TECNOLOGIAS DETECTADAS:")
-    print("-" * 25)
+    lines.append(f"\n🛠️ TECNOLOGIAS DETECTADAS:")
+    lines.append("-" * 25)
     
     technologies = []
     
@@ -185,36 +199,51 @@ def analyze_project_comprehensive(project_path: str) -> None:
         technologies.append("🐳 Docker")
     
     for tech in technologies:
-        print(f"  {tech}")
+        lines.append(f"  {tech}")
     
     # Provide execution suggestions
-    print(f"\n🚀 SUGESTÕES DE EXECUÇÃO:")
-    print("-" * 25)
+    lines.append(f"\n🚀 SUGESTÕES DE EXECUÇÃO:")
+    lines.append("-" * 25)
     
     if any('pom.xml' in f[1] for f in found_files):
-        print("☕ Para projetos Maven (Java):")
-        print("   mvn clean install")
-        print("   mvn spring-boot:run")
+        lines.append("☕ Para projetos Maven (Java):")
+        lines.append("   mvn clean install")
+        lines.append("   mvn spring-boot:run")
     
     if any('build.gradle' in f[1] for f in found_files):
-        print("🐘 Para projetos Gradle:")
-        print("   ./gradlew build")
-        print("   ./gradlew bootRun")
+        lines.append("🐘 Para projetos Gradle:")
+        lines.append("   ./gradlew build")
+        lines.append("   ./gradlew bootRun")
     
     if any('package.json' in f[1] for f in found_files):
-        print("📦 Para projetos Node.js:")
-        print("   npm install")
-        print("   npm start")
+        lines.append("📦 Para projetos Node.js:")
+        lines.append("   npm install")
+        lines.append("   npm start")
     
     if any('requirements.txt' in f[1] for f in found_files):
-        print("🐍 Para projetos Python:")
-        print("   pip install -r requirements.txt")
-        print("   python main.py")
+        lines.append("🐍 Para projetos Python:")
+        lines.append("   pip install -r requirements.txt")
+        lines.append("   python main.py")
     
     if any('Dockerfile' in f[1] for f in found_files):
-        print("🐳 Para Docker:")
-        print("   docker build -t app .")
-        print("   docker run -p 8080:8080 app")
+        lines.append("🐳 Para Docker:")
+        lines.append("   docker build -t app .")
+        lines.append("   docker run -p 8080:8080 app")
+
+    return "\n".join(lines)
+
+def analyze_project_comprehensive(project_path: str) -> str:
+    """
+    Comprehensive analysis of the downloaded project.
+    
+    Concurrent analyses of the same project share a single walk of the tree.
+    
+    Returns:
+        The analysis report (also printed to stdout)
+    """
+    report = _analyses.do(os.path.abspath(project_path), _build_analysis_report, project_path)
+    print(report)
+    return report
 
 def main():
     """Main function to download and analyze the GitHub repository."""
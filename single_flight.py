@@ -0,0 +1,116 @@
+"""
+Deduplicação "single-flight" de operações idênticas em andamento.
+
+Quando várias chamadas concorrentes pedem a mesma chave (a mesma URL, o
+mesmo repositório), só a primeira executa; as demais esperam por ela e
+recebem o mesmo resultado (ou a mesma exceção). Não é um cache: assim que a
+operação termina a chave é liberada e a próxima chamada executa de novo.
+"""
+import json
+import threading
+
+_registry = {}
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Agrupa chamadas concorrentes (threads) com a mesma chave em uma única execução.
+
+    Uso:
+        fetches = SingleFlight("fetch_url")
+        text = fetches.do(url, requests_get_text, url)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stats = {"calls": 0, "executed": 0, "coalesced": 0}
+        self._lock = threading.Lock()
+        self._calls = {}
+        _registry[name] = self
+
+    def do(self, key, fn, *args, **kwargs):
+        """Executa `fn(*args, **kwargs)` uma vez por chave entre as threads concorrentes."""
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.stats["coalesced"] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.stats["executed"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+def all_stats() -> dict:
+    """Contadores de todas as instâncias: {nome: {"calls", "executed", "coalesced"}}."""
+    return {name: dict(flight.stats) for name, flight in _registry.items()}
+
+class FetchDispatcher:
+    """
+    Atende `fetch_url` nos servidores stdio (mcp_local, mcp_fetch_url, mcp_save_file).
+
+    Cada fetch roda em uma thread do pool, então as respostas voltam fora de
+    ordem, associadas pelo id. Fetches concorrentes da mesma URL compartilham
+    uma única requisição HTTP. Toda resposta JSON-RPC passa por `respond`,
+    que serializa a escrita no stdout.
+
+    Uso:
+        dispatcher = FetchDispatcher(get_text, lambda url, e: f"Erro: {e}")
+        dispatcher.submit(url, rpc_id)
+        dispatcher.respond({"jsonrpc": "2.0", "id": rpc_id, "result": all_stats()})
+        dispatcher.close()
+    """
+
+    def __init__(self, get_text, error_message, max_workers: int = 32):
+        from concurrent.futures import ThreadPoolExecutor  # só os servidores stdio usam o pool
+        self._get_text = get_text
+        self._error_message = error_message
+        self._fetches = SingleFlight("fetch_url")
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._stdout_lock = threading.Lock()
+
+    def respond(self, response: dict) -> None:
+        with self._stdout_lock:
+            print(json.dumps(response), flush=True)
+
+    def fetch(self, url: str) -> str:
+        """Fetch síncrono e agrupado; erros viram a mensagem de erro do servidor."""
+        try:
+            return self._fetches.do(url, self._get_text, url)
+        except Exception as e:
+            return self._error_message(url, e)
+
+    def submit(self, url: str, rpc_id) -> None:
+        self._executor.submit(self._handle, url, rpc_id)
+
+    def _handle(self, url: str, rpc_id) -> None:
+        self.respond({"jsonrpc": "2.0", "id": rpc_id, "result": self.fetch(url)})
+
+    def close(self) -> None:
+        """Espera os fetches pendentes responderem."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,99 @@
+"""
+Cliente assíncrono para os servidores JSON-RPC por linha deste projeto
+(`mcp_local.py`, `mcp_fetch_url.py`, `mcp_save_file.py`).
+
+Cada requisição é uma linha JSON no stdin do processo e cada resposta uma
+linha JSON no stdout; as respostas são associadas às requisições pelo `id`.
+"""
+import asyncio
+import itertools
+import json
+import sys
+
+class StdioRpcError(Exception):
+    """Erro retornado pelo servidor ou falha na comunicação com o processo."""
+
+class StdioJsonRpcClient:
+    """
+    Mantém um processo servidor aberto e envia requisições JSON-RPC a ele.
+
+    Uso:
+        async with StdioJsonRpcClient(sys.executable, ["mcp_save_file.py"]) as client:
+            result = await client.call("save_file", {"path": "out/a.txt", "content": "..."})
+    """
+
+    def __init__(self, command: str = sys.executable, args: list[str] = None):
+        self.command = command
+        self.args = list(args or [])
+        self._process = None
+        self._reader = None
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._write_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self) -> None:
+        self._process = await asyncio.create_subprocess_exec(
+            self.command, *self.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=2 ** 26,  # páginas inteiras cabem em uma única linha de resposta
+        )
+        self._reader = asyncio.create_task(self._read_responses())
+
+    async def _read_responses(self) -> None:
+        while True:
+            line = await self._process.stdout.readline()
+            if not line:
+                break
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # saída que não é JSON-RPC (ex.: prints de debug)
+            future = self._pending.pop(response.get("id"), None)
+            if future is None and "error" in response and self._pending:
+                # Erros de parse voltam com id nulo: falha a requisição mais antiga
+                future = self._pending.pop(next(iter(self._pending)))
+            if future is None or future.done():
+                continue
+            if "error" in response:
+                future.set_exception(StdioRpcError(response["error"]))
+            else:
+                future.set_result(response.get("result"))
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(StdioRpcError(f"Processo {self.command} encerrado"))
+        self._pending.clear()
+
+    async def call(self, method: str, params: dict = None, timeout: float = None):
+        """Envia uma requisição e aguarda o `result` correspondente."""
+        if self._process is None:
+            raise StdioRpcError("Cliente não iniciado")
+        rpc_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[rpc_id] = future
+        request = {"jsonrpc": "2.0", "id": rpc_id, "method": method, "params": params or {}}
+        async with self._write_lock:
+            self._process.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+            await self._process.stdin.drain()
+        return await asyncio.wait_for(future, timeout)
+
+    async def close(self) -> None:
+        if self._process is None:
+            return
+        if self._process.stdin and not self._process.stdin.is_closing():
+            self._process.stdin.close()
+        try:
+            await asyncio.wait_for(self._process.wait(), 5)
+        except asyncio.TimeoutError:
+            self._process.kill()
+            await self._process.wait()
+        if self._reader is not None:
+            await self._reader
+        self._process = None
@@ -0,0 +1,46 @@
+"""
+Contagem de tokens e chunking por tokens com o tokenizer do modelo (tiktoken).
+
+Compartilhado pelo resumo hierárquico, pela seleção de contexto e pelo
+agendador de rate limit. Sem acesso à rede para baixar os encodings do
+tiktoken, cai para uma contagem aproximada (~4 caracteres por token).
+"""
+
+DEFAULT_MODEL = "gpt-4.1-mini"
+
+_encodings = {}
+
+class _ApproximateEncoding:
+    """~4 caracteres por token, usado quando o tokenizer não pode ser carregado (ex.: offline)."""
+
+    def encode(self, text: str) -> list[str]:
+        return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+    def decode(self, tokens: list[str]) -> str:
+        return "".join(tokens)
+
+def _encoding_for(model: str):
+    encoding = _encodings.get(model)
+    if encoding is None:
+        try:
+            import tiktoken
+            try:
+                encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # O tiktoken baixa os arquivos de encoding na primeira execução
+            print(f"⚠️ Tokenizer indisponível ({type(e).__name__}), usando contagem aproximada de tokens")
+            encoding = _ApproximateEncoding()
+        _encodings[model] = encoding
+    return encoding
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """Conta os tokens do texto com o tokenizer do modelo."""
+    return len(_encoding_for(model).encode(text))
+
+def chunk_by_tokens(text: str, size: int, model: str = DEFAULT_MODEL) -> list[str]:
+    """Divide o texto em chunks de no máximo `size` tokens."""
+    encoding = _encoding_for(model)
+    tokens = encoding.encode(text)
+    return [encoding.decode(tokens[i:i + size]) for i in range(0, len(tokens), size)]
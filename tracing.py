@@ -0,0 +1,238 @@
+"""
+Tracing leve por etapa para os pipelines de agentes.
+
+Cada etapa (fetch, parse, chunking, resumo, geração, gravação) é um span com
+tempo de parede, tokens do uso do modelo, bytes baixados ou gravados e número de
+chamadas de ferramenta. Os spans são exportados em JSONL e no formato Chrome
+trace-event (abra em chrome://tracing ou https://ui.perfetto.dev).
+
+Desligado por padrão: `span()` devolve um objeto nulo compartilhado, sem
+alocar nem medir nada. Para ligar:
+
+    MCP_TRACE=traces/run python agent_java_parse_code.py
+    # grava traces/run.jsonl e traces/run.trace.json ao final
+
+ou no código:
+
+    from tracing import tracer
+    tracer.enable()
+    ...
+    tracer.export_jsonl("run.jsonl")
+    tracer.export_chrome("run.trace.json")
+"""
+import asyncio
+import atexit
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+
+TRACE_ENV = "MCP_TRACE"
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+def _usage_of(result) -> tuple[int, int, int]:
+    """Soma (prompt_tokens, completion_tokens, tool_calls) de um TaskResult ou CreateResult."""
+    usages = []
+    tool_calls = 0
+    messages = getattr(result, "messages", None)
+    if messages is not None:
+        for message in messages:
+            if getattr(message, "models_usage", None) is not None:
+                usages.append(message.models_usage)
+            if type(message).__name__ == "ToolCallRequestEvent":
+                tool_calls += len(message.content)
+    elif getattr(result, "usage", None) is not None:
+        usages.append(result.usage)
+    prompt = sum(u.prompt_tokens for u in usages)
+    completion = sum(u.completion_tokens for u in usages)
+    return prompt, completion, tool_calls
+
+class Span:
+    """Um intervalo medido; usado como `with tracer.span("etapa") as s:`."""
+
+    __slots__ = ("tracer", "name", "attrs", "span_id", "parent_id", "tid", "start_ns", "end_ns", "_token")
+
+    def __init__(self, tracer, name: str, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.span_id = next(tracer._ids)
+        self.parent_id = None
+        self.tid = 0
+        self.start_ns = 0
+        self.end_ns = 0
+        self._token = None
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.tid = self.tracer._lane()
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.perf_counter_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer._record(self)
+        return False
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def add(self, key: str, amount: int = 1) -> None:
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+    def record_usage(self, result) -> None:
+        """Acumula tokens e chamadas de ferramenta de um TaskResult/CreateResult."""
+        prompt, completion, tool_calls = _usage_of(result)
+        self.add("prompt_tokens", prompt)
+        self.add("completion_tokens", completion)
+        if tool_calls:
+            self.add("tool_calls", tool_calls)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+class _NoopSpan:
+    """Span nulo devolvido quando o tracing está desligado."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def add(self, key: str, amount: int = 1) -> None:
+        pass
+
+    def record_usage(self, result) -> None:
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class Tracer:
+    """Coleta spans em memória e exporta em JSONL ou Chrome trace-event."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.spans = []
+        self._ids = itertools.count(1)
+        self._lanes = {}
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+    def span(self, name: str, **attrs):
+        """Abre um span; com o tracing desligado devolve um span nulo."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attrs)
+
+    def _lane(self) -> int:
+        # Uma "thread" do Chrome trace por task asyncio, para spans concorrentes não se sobreporem
+        try:
+            key = id(asyncio.current_task())
+        except RuntimeError:
+            key = threading.get_ident()
+        with self._lock:
+            return self._lanes.setdefault(key, len(self._lanes) + 1)
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def _as_dict(self, span: Span) -> dict:
+        return {
+            "name": span.name,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "tid": span.tid,
+            "start_us": (span.start_ns - self._origin_ns) / 1000,
+            "duration_ms": span.duration_ms,
+            **span.attrs,
+        }
+
+    def export_jsonl(self, path: str) -> None:
+        """Um span por linha, na ordem em que terminaram."""
+        _ensure_parent_dir(path)
+        with open(path, "w", encoding="utf-8") as f:
+            for span in list(self.spans):
+                f.write(json.dumps(self._as_dict(span), default=str) + "\n")
+
+    def export_chrome(self, path: str) -> None:
+        """Formato Chrome trace-event (eventos "X" completos) para visualização em flame chart."""
+        pid = os.getpid()
+        events = [{
+            "name": span.name,
+            "cat": span.name.split(".")[0],
+            "ph": "X",
+            "ts": (span.start_ns - self._origin_ns) / 1000,
+            "dur": (span.end_ns - span.start_ns) / 1000,
+            "pid": pid,
+            "tid": span.tid,
+            "args": span.attrs,
+        } for span in list(self.spans)]
+        _ensure_parent_dir(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+    def summary(self) -> dict:
+        """Totais por nome de span: chamadas, tempo, tokens, bytes e chamadas de ferramenta."""
+        totals = {}
+        for span in list(self.spans):
+            entry = totals.setdefault(span.name, {"count": 0, "wall_ms": 0.0})
+            entry["count"] += 1
+            entry["wall_ms"] += span.duration_ms
+            for key in ("prompt_tokens", "completion_tokens", "bytes", "tool_calls"):
+                if key in span.attrs:
+                    entry[key] = entry.get(key, 0) + span.attrs[key]
+        return totals
+
+    def print_summary(self) -> None:
+        print(f"\n{'etapa':<24}{'n':>5}{'tempo ms':>12}{'tokens in':>11}{'tokens out':>12}{'bytes':>10}{'tools':>7}")
+        for name, entry in sorted(self.summary().items(), key=lambda item: -item[1]["wall_ms"]):
+            print(f"{name:<24}{entry['count']:>5}{entry['wall_ms']:>12.1f}{entry.get('prompt_tokens', 0):>11}"
+                  f"{entry.get('completion_tokens', 0):>12}{entry.get('bytes', 0):>10}{entry.get('tool_calls', 0):>7}")
+
+def _ensure_parent_dir(path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+tracer = Tracer(enabled=bool(os.environ.get(TRACE_ENV)))
+
+def span(name: str, **attrs):
+    """Atalho para `tracer.span(...)` no tracer global."""
+    return tracer.span(name, **attrs)
+
+def _export_on_exit() -> None:
+    prefix = os.environ.get(TRACE_ENV)
+    if not prefix or not tracer.spans:
+        return
+    tracer.export_jsonl(f"{prefix}.jsonl")
+    tracer.export_chrome(f"{prefix}.trace.json")
+    tracer.print_summary()
+    print(f"\n🧭 Trace salvo em {prefix}.jsonl e {prefix}.trace.json")
+
+atexit.register(_export_on_exit)